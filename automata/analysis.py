@@ -0,0 +1,189 @@
+# automata/analysis.py
+"""Estadísticas del lenguaje de un AFD: conteo y muestreo por longitud.
+
+Todo trabaja sobre la tabla de un ``CompiledDFA`` (el sumidero incluido),
+con enteros de Python, así que los conteos son exactos para cualquier n:
+
+* ``count_accepted(dfa, n)``: programación dinámica O(n·|Q|·|Σ|) para n
+  moderado y exponenciación de matrices O(|Q|³·log n) para n muy grande.
+* ``sample(dfa, n, k)``: k cadenas de longitud n elegidas uniformemente
+  entre las aceptadas (o las rechazadas).
+* ``compare(candidate, reference, n)``: cuántas cadenas de longitud n acepta
+  cada uno y en cuántas discrepan, vía el autómata producto.
+"""
+import random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from automata.dfa import CompiledDFA, check_cancel
+
+class _Table:
+    """Vista mínima de un AFD completo: filas de destinos por símbolo."""
+
+    __slots__ = ("symbols", "rows", "accepting", "start")
+
+    def __init__(self, symbols, rows, accepting, start):
+        self.symbols = symbols
+        self.rows = rows
+        self.accepting = accepting
+        self.start = start
+
+    @classmethod
+    def of(cls, dfa: CompiledDFA, symbols: Optional[Sequence[str]] = None) -> "_Table":
+        symbols = tuple(symbols) if symbols is not None else dfa.symbols
+        cols = [dfa.column(sym) for sym in symbols]
+        rows = []
+        for state_id in range(dfa.dead + 1):
+            targets = dfa.targets(state_id)
+            rows.append([targets[c] for c in cols])
+        return cls(symbols, rows, [bool(a) for a in dfa.accepting], dfa.start)
+
+    def complement(self) -> "_Table":
+        return _Table(self.symbols, self.rows, [not a for a in self.accepting], self.start)
+
+def _product(a: CompiledDFA, b: CompiledDFA, accept, cancel=None) -> _Table:
+    symbols = tuple(sorted(set(a.symbols) | set(b.symbols)))
+    ta, tb = _Table.of(a, symbols), _Table.of(b, symbols)
+    ids = {(ta.start, tb.start): 0}
+    order = [(ta.start, tb.start)]
+    rows = []
+    for i, j in order:
+        check_cancel(cancel, len(rows) + 1)
+        row = []
+        for x, y in zip(ta.rows[i], tb.rows[j]):
+            if (x, y) not in ids:
+                ids[(x, y)] = len(order)
+                order.append((x, y))
+            row.append(ids[(x, y)])
+        rows.append(row)
+    accepting = [accept(ta.accepting[i], tb.accepting[j]) for i, j in order]
+    return _Table(symbols, rows, accepting, 0)
+
+# ---------------- CONTEO ----------------
+def _counts_dp(table: _Table, max_n: int, cancel=None) -> List[int]:
+    vec = [0] * len(table.rows)
+    vec[table.start] = 1
+    counts = []
+    for n in range(max_n + 1):
+        counts.append(sum(v for v, acc in zip(vec, table.accepting) if acc))
+        if n == max_n:
+            break
+        nxt = [0] * len(vec)
+        for q, ways in enumerate(vec):
+            check_cancel(cancel, q + 1)
+            if ways:
+                for to in table.rows[q]:
+                    nxt[to] += ways
+        vec = nxt
+    return counts
+
+def _mat_mul(a, b):
+    size = len(a)
+    cols = list(zip(*b))
+    return [[sum(x * y for x, y in zip(a[i], cols[j]) if x and y) for j in range(size)] for i in range(size)]
+
+def _vec_mul(vec, m):
+    # Vector fila por matriz: O(|Q|²), saltando las entradas nulas del vector.
+    out = [0] * len(vec)
+    for x, row in zip(vec, m):
+        if x:
+            for j, y in enumerate(row):
+                if y:
+                    out[j] += x * y
+    return out
+
+def _count_matrix(table: _Table, n: int, cancel=None) -> int:
+    size = len(table.rows)
+    step = [[0] * size for _ in range(size)]
+    for q, row in enumerate(table.rows):
+        for to in row:
+            step[q][to] += 1
+    # Solo se acumula el vector fila del inicial (O(|Q|²) por producto); los
+    # cuadrados de ``step`` siguen costando O(|Q|³) cada uno.
+    vec = [0] * size
+    vec[table.start] = 1
+    while n:
+        check_cancel(cancel, 0)
+        if n & 1:
+            vec = _vec_mul(vec, step)
+        n >>= 1
+        if n:
+            step = _mat_mul(step, step)
+    return sum(v for v, acc in zip(vec, table.accepting) if acc)
+
+def _count(table: _Table, n: int, cancel=None) -> int:
+    # La DP cuesta ~n·|Q|·|Σ|; la potencia de matrices ~|Q|³·log n.
+    size = len(table.rows)
+    if n * len(table.symbols) <= size * size * max(n.bit_length(), 1):
+        return _counts_dp(table, n, cancel)[-1]
+    return _count_matrix(table, n, cancel)
+
+def counts_by_length(dfa: CompiledDFA, max_n: int) -> List[int]:
+    """Cadenas aceptadas de cada longitud 0..max_n."""
+    return _counts_dp(_Table.of(dfa), max_n)
+
+def count_accepted(dfa: CompiledDFA, n: int) -> int:
+    return _count(_Table.of(dfa), n)
+
+def count_total(dfa: CompiledDFA, n: int) -> int:
+    return len(dfa.symbols) ** n
+
+def compare(candidate: CompiledDFA, reference: CompiledDFA, n: int, cancel=None) -> Dict[str, int]:
+    """Conteos de longitud ``n`` sobre la unión de ambos alfabetos."""
+    symbols = tuple(sorted(set(candidate.symbols) | set(reference.symbols)))
+    return {
+        "length": n,
+        "total": len(symbols) ** n,
+        "candidate": _count(_Table.of(candidate, symbols), n, cancel),
+        "reference": _count(_Table.of(reference, symbols), n, cancel),
+        "disagree": _count(_product(candidate, reference, lambda x, y: x != y, cancel), n, cancel),
+    }
+
+# ---------------- MUESTREO ----------------
+def _completions(table: _Table, n: int) -> List[List[int]]:
+    # ways[r][q]: cadenas de longitud r que llevan de q a un estado de aceptación.
+    ways = [[int(a) for a in table.accepting]]
+    for _ in range(n):
+        prev = ways[-1]
+        ways.append([sum(prev[to] for to in row) for row in table.rows])
+    return ways
+
+def _sample(table: _Table, n: int, count: int, rng: random.Random) -> List[str]:
+    ways = _completions(table, n)
+    if ways[n][table.start] == 0:
+        return []
+    out = []
+    for _ in range(count):
+        q = table.start
+        word = []
+        for remaining in range(n, 0, -1):
+            pick = rng.randrange(ways[remaining][q])
+            for sym, to in zip(table.symbols, table.rows[q]):
+                pick -= ways[remaining - 1][to]
+                if pick < 0:
+                    word.append(sym)
+                    q = to
+                    break
+        out.append("".join(word))
+    return out
+
+def sample(dfa: CompiledDFA, n: int, count: int = 1, accepted: bool = True,
+           rng: Optional[random.Random] = None) -> List[str]:
+    """``count`` cadenas de longitud ``n``, uniformes entre las aceptadas
+    (o rechazadas si ``accepted=False``). Lista vacía si no hay ninguna."""
+    table = _Table.of(dfa)
+    if not accepted:
+        table = table.complement()
+    return _sample(table, n, count, rng or random.Random())
+
+def example_sets(dfa: CompiledDFA, lengths: Sequence[int] = (0, 1, 2, 3, 4), per_length: int = 1,
+                 seed: int = 0) -> Tuple[List[str], List[str]]:
+    """Ejemplos aceptados y rechazados (sin repetir) para mostrar en un nivel."""
+    rng = random.Random(seed)
+    table = _Table.of(dfa)
+    pos, neg = [], []
+    for n in lengths:
+        for words, t in ((pos, table), (neg, table.complement())):
+            for w in _sample(t, n, per_length, rng):
+                if w not in words:
+                    words.append(w)
+    return pos, neg
@@ -0,0 +1,214 @@
+# automata/compact.py
+"""AFD editable en arreglos planos, para autómatas de 10^5–10^6 estados.
+
+``CompactDFA`` ofrece la misma API básica que ``DFA`` (``add_state``,
+``set_start``, ``set_accept``, ``set_transition``, ``run``, ``compile``),
+pero no crea un objeto por estado ni una tupla por transición:
+
+* los estados son ids enteros; sus nombres van en un bloque UTF-8 con
+  desplazamientos (``array('I')``) y un índice hash abierto (``array('i')``)
+  para buscarlos por nombre;
+* los símbolos se internan como columnas 0..k-1;
+* las transiciones viven en una rejilla ``array('i')`` de n·k celdas
+  (``-1`` = sin transición) que crece por filas;
+* los estados de aceptación son un conjunto de bits.
+
+Así una transición cuesta del orden de 10 bytes en vez de ~200. Los métodos
+aceptan ids o ``State`` (que se buscan por nombre); ``start`` devuelve un
+``State`` como en ``DFA`` y ``start_id`` el id entero.
+"""
+from array import array
+from typing import Iterable, Optional
+
+from automata.dfa import DFA, CompiledDFA, NameTable, State
+
+class CompactDFA:
+    def __init__(self, alphabet: Iterable[str]):
+        self.symbols = tuple(sorted(set(alphabet)))
+        self.alphabet = set(self.symbols)
+        self._cols = {sym: col for col, sym in enumerate(self.symbols)}
+        self._row = array("i", [-1]) * len(self.symbols)
+        self.grid = array("i")
+        self._blob = bytearray()
+        self._offsets = array("I", [0])
+        self._slots = array("i", [-1]) * 8
+        self._accept = bytearray()
+        self._start = -1
+        self._compiled: Optional[CompiledDFA] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    # ---------------- NOMBRES ----------------
+    def name_of(self, state_id: int) -> str:
+        return self._blob[self._offsets[state_id]:self._offsets[state_id + 1]].decode("utf-8")
+
+    def _slot(self, raw: bytes) -> int:
+        # Sondeo lineal: devuelve la ranura con ese nombre o la primera libre.
+        slots, offsets, blob = self._slots, self._offsets, self._blob
+        mask = len(slots) - 1
+        h = hash(raw) & mask
+        while True:
+            i = slots[h]
+            if i < 0 or blob[offsets[i]:offsets[i + 1]] == raw:
+                return h
+            h = (h + 1) & mask
+
+    def _grow_slots(self) -> None:
+        self._slots = array("i", [-1]) * (2 * len(self._slots))
+        for i in range(len(self)):
+            raw = bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+            self._slots[self._slot(raw)] = i
+
+    def state_named(self, name: str) -> Optional[int]:
+        i = self._slots[self._slot(name.encode("utf-8"))]
+        return i if i >= 0 else None
+
+    def _id(self, state) -> int:
+        if isinstance(state, State):
+            i = self.state_named(state.name)
+            if i is None:
+                raise ValueError(f"Estado desconocido: {state.name!r}")
+            return i
+        if not 0 <= state < len(self):
+            raise ValueError(f"Estado desconocido: {state!r}")
+        return state
+
+    # ---------------- EDICIÓN ----------------
+    def add_state(self, name: str, is_start=False, is_accept=False) -> int:
+        """Agrega el estado (o reutiliza el que ya tenga ese nombre) y devuelve su id."""
+        raw = name.encode("utf-8")
+        h = self._slot(raw)
+        i = self._slots[h]
+        if i < 0:
+            i = len(self)
+            self._slots[h] = i
+            self._blob += raw
+            self._offsets.append(len(self._blob))
+            self.grid.extend(self._row)
+            if len(self._accept) * 8 <= i:
+                self._accept.append(0)
+            if 2 * len(self) > len(self._slots):
+                self._grow_slots()
+        if is_start:
+            self.set_start(i)
+        if is_accept:
+            self.set_accept(i)
+        self._compiled = None
+        return i
+
+    @property
+    def start(self) -> Optional[State]:
+        return State(self.name_of(self._start)) if self._start >= 0 else None
+
+    @property
+    def start_id(self) -> Optional[int]:
+        return self._start if self._start >= 0 else None
+
+    def set_start(self, state) -> None:
+        self._start = self._id(state) if state is not None else -1
+        self._compiled = None
+
+    def is_accept(self, state) -> bool:
+        i = self._id(state)
+        return bool(self._accept[i >> 3] >> (i & 7) & 1)
+
+    def set_accept(self, state, accepting: bool = True) -> None:
+        i = self._id(state)
+        if accepting:
+            self._accept[i >> 3] |= 1 << (i & 7)
+        else:
+            self._accept[i >> 3] &= ~(1 << (i & 7)) & 0xFF
+        self._compiled = None
+
+    def set_transition(self, from_state, symbol: str, to_state) -> None:
+        if symbol not in self._cols:
+            raise ValueError(f"Symbol '{symbol}' not in alphabet {self.alphabet}")
+        self.grid[self._id(from_state) * len(self.symbols) + self._cols[symbol]] = self._id(to_state)
+        self._compiled = None
+
+    def remove_transition(self, from_state, symbol: str) -> None:
+        cell = self._id(from_state) * len(self.symbols) + self._cols[symbol]
+        if self.grid[cell] < 0:
+            raise KeyError((from_state, symbol))
+        self.grid[cell] = -1
+        self._compiled = None
+
+    def target(self, from_state, symbol: str) -> Optional[int]:
+        col = self._cols.get(symbol)
+        if col is None:
+            return None
+        to = self.grid[self._id(from_state) * len(self.symbols) + col]
+        return to if to >= 0 else None
+
+    # ---------------- EJECUCIÓN ----------------
+    def run(self, input_str: str) -> bool:
+        if self._start < 0:
+            raise RuntimeError("Start state not set.")
+        grid, cols, k = self.grid, self._cols, len(self.symbols)
+        current = self._start
+        for ch in input_str:
+            col = cols.get(ch)
+            if col is None:
+                return False
+            current = grid[current * k + col]
+            if current < 0:
+                return False
+        return bool(self._accept[current >> 3] >> (current & 7) & 1)
+
+    def compile(self) -> CompiledDFA:
+        """Tabla densa con los estados en orden de id (el sumidero al final)."""
+        if self._start < 0:
+            raise RuntimeError("Start state not set.")
+        if self._compiled is not None:
+            return self._compiled
+        n, k = len(self), len(self.symbols)
+        runnable = [(col, sym) for col, sym in enumerate(self.symbols) if len(sym) == 1]
+        width = len(runnable) + 1
+        dead_row = n * width
+        table = array("i", [dead_row]) * ((n + 1) * width)
+        for out_col, (col, _) in enumerate(runnable):
+            targets = self.grid[col::k]
+            table[out_col:n * width:width] = array("i", [t * width if t >= 0 else dead_row for t in targets])
+        accept = self._accept
+        accepting = bytearray(accept[i >> 3] >> (i & 7) & 1 for i in range(n))
+        accepting.append(0)
+        states = NameTable(array("I", self._offsets), bytes(self._blob))
+        self._compiled = CompiledDFA(states, tuple(sym for _, sym in runnable), table, self._start, accepting)
+        return self._compiled
+
+    def run_many(self, strings: Iterable[str], return_states: bool = False):
+        return self.compile().run_many(strings, return_states)
+
+    def canonical_hash(self, cancel=None) -> str:
+        return self.compile().canonical_hash(cancel)
+
+    # ---------------- CONVERSIÓN ----------------
+    @classmethod
+    def from_dfa(cls, dfa: DFA) -> "CompactDFA":
+        compact = cls(dfa.alphabet)
+        for state in sorted(dfa.states, key=lambda s: s.name):
+            compact.add_state(state.name, is_accept=state in dfa.accept)
+        for (frm, sym), to in dfa.transitions.items():
+            compact.set_transition(frm, sym, to)
+        if dfa.start is not None:
+            compact.set_start(compact.add_state(dfa.start.name))
+        return compact
+
+    def to_dfa(self) -> DFA:
+        dfa = DFA(alphabet=set(self.symbols))
+        states = [dfa.add_state(self.name_of(i), is_accept=self.is_accept(i)) for i in range(len(self))]
+        k = len(self.symbols)
+        for cell, to in enumerate(self.grid):
+            if to >= 0:
+                frm, col = divmod(cell, k)
+                dfa.set_transition(states[frm], self.symbols[col], states[to])
+        if self._start >= 0:
+            dfa.set_start(states[self._start])
+        return dfa
+
+    def nbytes(self) -> int:
+        """Bytes ocupados por los arreglos (sin contar los objetos de Python)."""
+        return (self.grid.itemsize * len(self.grid) + len(self._blob)
+                + self._offsets.itemsize * len(self._offsets)
+                + self._slots.itemsize * len(self._slots) + len(self._accept))
@@ -1,11 +1,383 @@
 # automata/dfa.py
+import hashlib
+from array import array
+from collections import Counter, deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Dict, Set, Tuple
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from automata import instrument
+from automata.stream import StreamRunner
+from automata.structure import StructureIndex
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: run_many cae a un bucle en Python
+    np = None
+
+class Cancelled(Exception):
+    """Se interrumpió una operación larga porque ``cancel()`` devolvió True."""
+
+def check_cancel(cancel, steps: int) -> None:
+    # Consulta ``cancel`` cada 1024 pasos para no pagarla en cada iteración.
+    if cancel is not None and not steps & 1023 and cancel():
+        raise Cancelled()
 
 @dataclass(frozen=True)
 class State:
     name: str
 
+class _ColumnMap(dict):
+    # Tabla para str.translate: todo carácter fuera del alfabeto cae en la
+    # columna "desconocida", que siempre lleva al sumidero.
+    def __init__(self, columns: Dict[int, str], unknown: str):
+        super().__init__(columns)
+        self.unknown = unknown
+
+    def __missing__(self, key):
+        return self.unknown
+
+class NameTable(Sequence):
+    """Estados perezosos para ``CompiledDFA.states``: nombres en un bloque UTF-8.
+
+    ``offsets`` tiene un desplazamiento por estado más uno final; el nombre se
+    decodifica (y se crea el ``State``) solo al pedir el índice.
+    """
+    def __init__(self, offsets, blob):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return State(bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode("utf-8"))
+
+class CompiledDFA:
+    """Versión congelada de un DFA: estados como enteros y tabla densa.
+
+    Cada fila de ``table`` tiene ``width`` columnas (una por símbolo más la
+    columna de símbolos desconocidos) y guarda el desplazamiento de la fila
+    destino, de modo que ``run`` solo suma e indexa. La última fila es el
+    estado sumidero (``dead``).
+    """
+
+    __slots__ = ("states", "symbols", "width", "table", "start", "dead",
+                 "accepting", "_columns", "_as_bytes", "_np_table", "_byte_columns", "_fingerprint", "_canonical_hash")
+
+    def __init__(self, states: Tuple[State, ...], symbols: Tuple[str, ...],
+                 table: array, start: int, accepting: bytearray):
+        self.states = states
+        self.symbols = symbols
+        self.width = len(symbols) + 1
+        self.table = table
+        self.start = start
+        self.dead = len(states)
+        self.accepting = accepting
+        unknown = chr(len(symbols))
+        self._columns = _ColumnMap({ord(sym): chr(col) for col, sym in enumerate(symbols)}, unknown)
+        self._as_bytes = self.width <= 256
+        self._np_table = None
+        self._byte_columns = None
+        self._fingerprint = None
+        self._canonical_hash = None
+
+    def encode(self, input_str: str):
+        """Traduce la cadena a índices de columna (bytes si caben en uno)."""
+        cols = input_str.translate(self._columns)
+        if self._as_bytes:
+            return cols.encode("latin-1")
+        return [ord(c) for c in cols]
+
+    def run_state(self, input_str: str, record: bool = True) -> int:
+        """Devuelve el id del estado final (``dead`` si la cadena se atasca).
+
+        Con ``record=False`` no se suman visitas a ``instrument.transition_hits``
+        (para ejecuciones internas, como las del autómata de referencia).
+        """
+        if record and instrument.ENABLED:
+            return self._run_state_instrumented(input_str)
+        table = self.table
+        row = self.start * self.width
+        for col in self.encode(input_str):
+            row = table[row + col]
+        return row // self.width
+
+    def _run_state_instrumented(self, input_str: str) -> int:
+        t0 = instrument.clock()
+        table = self.table
+        width = self.width
+        row = self.start * width
+        steps = Counter()
+        for col in self.encode(input_str):
+            steps[row + col] += 1
+            row = table[row + col]
+        elapsed = instrument.clock() - t0
+        n_symbols = width - 1
+        for cell, hits in steps.items():
+            state_id, col = divmod(cell, width)
+            if state_id != self.dead and col < n_symbols:
+                instrument.transition_hits[(self.states[state_id], self.symbols[col])] += hits
+        instrument.record("CompiledDFA.run", elapsed, transitions=len(input_str))
+        return row // width
+
+    def run(self, input_str: str, record: bool = True) -> bool:
+        return bool(self.accepting[self.run_state(input_str, record)])
+
+    def run_many(self, strings: Iterable[str], return_states: bool = False):
+        """Evalúa un lote de cadenas a la vez.
+
+        Con NumPy las cadenas se agrupan en cubetas de longitud potencia de
+        dos, se rellenan con una columna neutra y avanzan juntas indexando la
+        tabla. Devuelve un arreglo booleano y, si ``return_states``, también
+        el id del estado final de cada cadena.
+        """
+        strings = list(strings)
+        if np is None:
+            final = [self.run_state(w) for w in strings]
+            accepted = [bool(self.accepting[i]) for i in final]
+            return (accepted, final) if return_states else accepted
+
+        table, pad = self._numpy_table()
+        stride = self.width + 1
+        # encode() da bytes hasta width 256, pero la columna de relleno (pad)
+        # solo cabe en uint8 si pad < 256.
+        dtype = np.uint8 if self._as_bytes and pad < 256 else np.int32
+        buckets: Dict[int, list] = {}
+        for idx, w in enumerate(strings):
+            buckets.setdefault(max(len(w) - 1, 0).bit_length(), []).append(idx)
+
+        final = np.empty(len(strings), dtype=np.int64)
+        for bits, idxs in buckets.items():
+            length = 1 << bits if bits else 1
+            if dtype is np.uint8:
+                filler = bytes([pad])
+                blob = b"".join(self.encode(strings[i]).ljust(length, filler) for i in idxs)
+                matrix = np.frombuffer(blob, dtype=np.uint8).reshape(len(idxs), length)
+            else:
+                matrix = np.full((len(idxs), length), pad, dtype=np.int32)
+                for r, i in enumerate(idxs):
+                    cols = self.encode(strings[i])
+                    if self._as_bytes:
+                        cols = np.frombuffer(cols, dtype=np.uint8)
+                    matrix[r, :len(cols)] = cols
+            rows = np.full(len(idxs), self.start * stride, dtype=np.int64)
+            for j in range(length):
+                rows = table[rows + matrix[:, j]]
+            final[idxs] = rows // stride
+
+        accepted = np.frombuffer(bytes(self.accepting), dtype=np.uint8).astype(bool)[final]
+        return (accepted, final) if return_states else accepted
+
+    def _numpy_table(self):
+        # Tabla con una columna extra de relleno que deja el estado igual.
+        if self._np_table is None:
+            n = self.dead + 1
+            targets = np.frombuffer(self.table, dtype=np.int32).reshape(n, self.width) // self.width
+            padded = np.hstack([targets, np.arange(n, dtype=np.int32)[:, None]])
+            self._np_table = (padded.astype(np.int64) * (self.width + 1)).ravel()
+        return self._np_table, self.width
+
+    def byte_columns(self):
+        """Columna de cada byte 0..255: ``bytes`` para translate si cabe, si no lista."""
+        if self._byte_columns is None:
+            cols = [self.column(chr(b)) for b in range(256)]
+            self._byte_columns = bytes(cols) if self.width <= 256 else cols
+        return self._byte_columns
+
+    def fingerprint(self) -> str:
+        # Identifica la tabla exacta (no el lenguaje) para validar checkpoints.
+        if self._fingerprint is None:
+            h = hashlib.sha1()
+            h.update(repr((self.symbols, self.start)).encode("utf-8"))
+            h.update(bytes(memoryview(self.table).cast("B")))
+            h.update(bytes(self.accepting))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def stream(self) -> StreamRunner:
+        return StreamRunner(self)
+
+    def column(self, symbol: str) -> int:
+        return ord(self._columns[ord(symbol)]) if len(symbol) == 1 else self.width - 1
+
+    def distinguish(self, other: "CompiledDFA", cancel=None) -> Optional[str]:
+        """Cadena más corta aceptada por exactamente uno de los dos autómatas.
+
+        BFS sobre el autómata producto desde (start, start); devuelve ``None``
+        si ambos reconocen el mismo lenguaje. O(|Q1|·|Q2|·|Σ|). Si
+        ``cancel()`` devuelve True a mitad del recorrido lanza ``Cancelled``.
+        """
+        symbols = sorted(set(self.symbols) | set(other.symbols))
+        cols = [(self.column(sym), other.column(sym)) for sym in symbols]
+        w1, w2 = self.width, other.width
+        t1, t2 = self.table, other.table
+        acc1, acc2 = self.accepting, other.accepting
+        n2 = other.dead + 1
+        first = self.start * n2 + other.start
+        parent = {first: None}
+        queue = deque([first])
+        steps = 0
+        while queue:
+            steps += 1
+            check_cancel(cancel, steps)
+            pair = queue.popleft()
+            i, j = divmod(pair, n2)
+            if acc1[i] != acc2[j]:
+                word = []
+                while parent[pair] is not None:
+                    pair, sym = parent[pair]
+                    word.append(sym)
+                return "".join(reversed(word))
+            for sym, (c1, c2) in zip(symbols, cols):
+                nxt = (t1[i * w1 + c1] // w1) * n2 + t2[j * w2 + c2] // w2
+                if nxt not in parent:
+                    parent[nxt] = (pair, sym)
+                    queue.append(nxt)
+        return None
+
+    def state_of(self, state_id: int) -> Optional[State]:
+        if state_id == self.dead:
+            return None
+        return self.states[state_id]
+
+    def targets(self, state_id: int):
+        # Ids destino de un estado, columna por columna (incluida la de desconocidos).
+        width = self.width
+        row = self.table[state_id * width:(state_id + 1) * width]
+        return [to // width for to in row]
+
+    def reachable(self):
+        seen = [False] * (self.dead + 1)
+        seen[self.start] = True
+        order = [self.start]
+        for state_id in order:
+            for to in self.targets(state_id):
+                if not seen[to]:
+                    seen[to] = True
+                    order.append(to)
+        return order
+
+    def minimize(self, cancel=None) -> "CompiledDFA":
+        """Algoritmo de Hopcroft sobre los estados alcanzables (incluido el sumidero)."""
+        width = self.width
+        order = self.reachable()
+        if self.dead not in order:
+            order.append(self.dead)
+        local = {state_id: i for i, state_id in enumerate(order)}
+        delta = [[local[to] for to in self.targets(state_id)] for state_id in order]
+        n = len(order)
+        inverse = [[[] for _ in range(n)] for _ in range(width)]
+        for i, row in enumerate(delta):
+            for col, to in enumerate(row):
+                inverse[col][to].append(i)
+
+        finals = {i for i, state_id in enumerate(order) if self.accepting[state_id]}
+        blocks = [b for b in (set(finals), set(range(n)) - finals) if b]
+        block_of = [0] * n
+        for b, members in enumerate(blocks):
+            for i in members:
+                block_of[i] = b
+        smallest = min(range(len(blocks)), key=lambda b: len(blocks[b]))
+        pending = {(smallest, col) for col in range(width)}
+        steps = 0
+        while pending:
+            steps += 1
+            check_cancel(cancel, steps)
+            splitter, col = pending.pop()
+            preimage = {i for to in blocks[splitter] for i in inverse[col][to]}
+            touched = {}
+            for i in preimage:
+                touched.setdefault(block_of[i], set()).add(i)
+            for b, inside in touched.items():
+                if len(inside) == len(blocks[b]):
+                    continue
+                blocks[b] -= inside
+                new = len(blocks)
+                blocks.append(inside)
+                for i in inside:
+                    block_of[i] = new
+                for c in range(width):
+                    if (b, c) in pending:
+                        pending.add((new, c))
+                    else:
+                        pending.add((new if len(inside) <= len(blocks[b]) else b, c))
+
+        dead_block = block_of[local[self.dead]]
+        if block_of[local[self.start]] == dead_block:
+            # Lenguaje vacío: queda solo el inicial, que cae al sumidero.
+            table = array("i", [width]) * (2 * width)
+            return CompiledDFA((self.states[self.start],), self.symbols, table, 0, bytearray(2))
+
+        # El bloque del sumidero pasa a ser la última fila.
+        ids = {}
+        for b in block_of:
+            if b != dead_block and b not in ids:
+                ids[b] = len(ids)
+        ids[dead_block] = len(ids)
+        states = [None] * (len(ids) - 1)
+        for i, state_id in enumerate(order):
+            b = ids[block_of[i]]
+            if b < len(states):
+                cand = self.states[state_id]
+                if states[b] is None or cand.name < states[b].name:
+                    states[b] = cand
+        table = array("i", [0]) * (len(ids) * width)
+        accepting = bytearray(len(ids))
+        for i, row in enumerate(delta):
+            b = ids[block_of[i]]
+            accepting[b] = i in finals
+            for col, to in enumerate(row):
+                table[b * width + col] = ids[block_of[to]] * width
+        start = ids[block_of[local[self.start]]]
+        return CompiledDFA(tuple(states), self.symbols, table, start, accepting)
+
+    def canonical(self) -> tuple:
+        """Forma canónica: estados renumerados en orden BFS desde el inicial.
+
+        Las transiciones al sumidero se escriben como -1, así que dos AFD
+        mínimos del mismo lenguaje producen exactamente la misma tupla.
+        """
+        width = self.width
+        ids = {self.start: 0}
+        order = [self.start]
+        rows = []
+        for state_id in order:
+            row = []
+            for to in self.targets(state_id)[:width - 1]:
+                if to == self.dead:
+                    row.append(-1)
+                    continue
+                if to not in ids:
+                    ids[to] = len(order)
+                    order.append(to)
+                row.append(ids[to])
+            rows.append(tuple(row))
+        accepting = tuple(i for i, state_id in enumerate(order) if self.accepting[state_id])
+        return self.symbols, accepting, tuple(rows)
+
+    def canonical_hash(self, cancel=None) -> str:
+        if self._canonical_hash is None:
+            canonical = repr(self.minimize(cancel).canonical()).encode("utf-8")
+            self._canonical_hash = hashlib.sha1(canonical).hexdigest()
+        return self._canonical_hash
+
+    def to_dfa(self) -> "DFA":
+        dfa = DFA(alphabet=set(self.symbols))
+        for i, state in enumerate(self.states):
+            dfa.add_state(state.name, is_start=i == self.start, is_accept=bool(self.accepting[i]))
+        for i, state in enumerate(self.states):
+            for sym, to in zip(self.symbols, self.targets(i)):
+                if to != self.dead:
+                    dfa.set_transition(state, sym, self.states[to])
+        return dfa
+
 @dataclass
 class DFA:
     alphabet: Set[str]
@@ -13,24 +385,158 @@ class DFA:
     start: State | None = None
     accept: Set[State] = field(default_factory=set)
     transitions: Dict[Tuple[State, str], State] = field(default_factory=dict)
+    _compiled: Optional[CompiledDFA] = field(default=None, init=False, repr=False, compare=False)
+    _index: Optional[StructureIndex] = field(default=None, init=False, repr=False, compare=False)
+    _stream: Optional[StreamRunner] = field(default=None, init=False, repr=False, compare=False)
+
+    def invalidate(self) -> None:
+        # Llamar tras modificar states/accept/transitions directamente.
+        self._compiled = None
+        self._index = None
+
+    @property
+    def index(self) -> StructureIndex:
+        """Índice estructural; se construye una vez y luego se actualiza solo."""
+        if self._index is None:
+            self._index = StructureIndex.build(self)
+        return self._index
+
+    def state_named(self, name: str) -> Optional[State]:
+        return self.index.state_named(name)
 
     def add_state(self, name: str, is_start=False, is_accept=False) -> State:
         s = State(name)
         self.states.add(s)
+        if self._index is not None:
+            self._index.add_state(s)
         if is_start:
-            self.start = s
+            self.set_start(s)
         if is_accept:
-            self.accept.add(s)
+            self.set_accept(s)
+        self._compiled = None
         return s
 
+    def remove_state(self, state: State) -> None:
+        # Las aristas incidentes salen del índice: O(grado·|Σ|), no O(|transiciones|).
+        index = self.index
+        transitions = self.transitions
+        keys = [(state, sym) for sym in self.alphabet if (state, sym) in transitions]
+        for frm in index.pred.get(state, ()):
+            if frm != state:
+                keys.extend((frm, sym) for sym in self.alphabet if transitions.get((frm, sym)) == state)
+        for key in keys:
+            del transitions[key]
+        self.states.discard(state)
+        self.accept.discard(state)
+        if self.start == state:
+            self.start = None
+        if state in index.succ:
+            index.remove_state(state)
+        self._compiled = None
+
+    def set_start(self, state: State) -> None:
+        self.start = state
+        if self._index is not None:
+            self._index.set_start(state)
+        self._compiled = None
+
+    def set_accept(self, state: State, accepting: bool = True) -> None:
+        if accepting:
+            self.accept.add(state)
+        else:
+            self.accept.discard(state)
+        if self._index is not None:
+            self._index.set_accept(state, accepting)
+        self._compiled = None
+
     def set_transition(self, from_state: State, symbol: str, to_state: State) -> None:
         if symbol not in self.alphabet:
             raise ValueError(f"Symbol '{symbol}' not in alphabet {self.alphabet}")
+        old = self.transitions.get((from_state, symbol))
         self.transitions[(from_state, symbol)] = to_state
+        if self._index is not None:
+            if old is not None:
+                self._index.remove_edge(from_state, old)
+            self._index.add_edge(from_state, to_state)
+        self._compiled = None
+
+    def remove_transition(self, from_state: State, symbol: str) -> None:
+        to_state = self.transitions.pop((from_state, symbol))
+        if self._index is not None:
+            self._index.remove_edge(from_state, to_state)
+        self._compiled = None
+
+    def compile(self) -> CompiledDFA:
+        if not self.start:
+            raise RuntimeError("Start state not set.")
+        compiled = self._compiled
+        if compiled is not None and compiled.states[compiled.start] == self.start:
+            return compiled
+        # Solo los símbolos de un carácter pueden aparecer en run().
+        symbols = tuple(sorted(sym for sym in self.alphabet if len(sym) == 1))
+        states = tuple(sorted(self.states | {self.start}, key=lambda s: s.name))
+        ids = {s: i for i, s in enumerate(states)}
+        width = len(symbols) + 1
+        dead = len(states)
+        table = array("i", [dead * width]) * ((dead + 1) * width)
+        for col, sym in enumerate(symbols):
+            for s, i in ids.items():
+                to = self.transitions.get((s, sym))
+                if to is not None and to in ids:
+                    table[i * width + col] = ids[to] * width
+        accepting = bytearray(dead + 1)
+        for s in self.accept:
+            if s in ids:
+                accepting[ids[s]] = 1
+        self._compiled = CompiledDFA(states, symbols, table, ids[self.start], accepting)
+        return self._compiled
+
+    def minimize(self) -> "DFA":
+        return self.compile().minimize().to_dfa()
+
+    def canonical_hash(self, cancel=None) -> str:
+        return self.compile().canonical_hash(cancel)
+
+    def distinguishing_string(self, other: "DFA") -> Optional[str]:
+        return self.compile().distinguish(other.compile())
+
+    def run_many(self, strings: Iterable[str], return_states: bool = False):
+        return self.compile().run_many(strings, return_states)
+
+    # ---------------- EJECUCIÓN POR TROZOS ----------------
+    def feed(self, chunk) -> bool:
+        """Avanza la ejecución en curso con ``chunk`` (str o bytes).
+
+        Devuelve False en cuanto se cae al sumidero. La ejecución sigue sobre
+        la tabla compilada al primer ``feed`` hasta ``reset_stream``.
+        """
+        if self._stream is None:
+            self._stream = self.compile().stream()
+        return self._stream.feed(chunk)
+
+    def result(self) -> bool:
+        if self._stream is None:
+            self._stream = self.compile().stream()
+        return self._stream.result()
+
+    def checkpoint(self) -> dict:
+        if self._stream is None:
+            self._stream = self.compile().stream()
+        return self._stream.checkpoint()
+
+    def reset_stream(self, checkpoint: Optional[dict] = None) -> None:
+        self._stream = StreamRunner.resume(self.compile(), checkpoint) if checkpoint else None
+
+    def run_file(self, path, chunk_size: int = 1 << 20, use_mmap: bool = False) -> bool:
+        runner = self.compile().stream()
+        runner.feed_file(path, chunk_size, use_mmap)
+        return runner.result()
 
     def run(self, input_str: str) -> bool:
         if not self.start:
             raise RuntimeError("Start state not set.")
+        if instrument.ENABLED:
+            return self._run_instrumented(input_str)
         current = self.start
         for ch in input_str:
             if ch not in self.alphabet:
@@ -39,4 +545,22 @@ class DFA:
             if key not in self.transitions:
                 return False
             current = self.transitions[key]
-        return current in self.accept
\ No newline at end of file
+        return current in self.accept
+
+    def _run_instrumented(self, input_str: str) -> bool:
+        t0 = instrument.clock()
+        hits = instrument.transition_hits
+        current = self.start
+        steps = 0
+        accepted = True
+        for ch in input_str:
+            key = (current, ch)
+            if ch not in self.alphabet or key not in self.transitions:
+                accepted = False
+                break
+            hits[key] += 1
+            steps += 1
+            current = self.transitions[key]
+        accepted = accepted and current in self.accept
+        instrument.record("DFA.run", instrument.clock() - t0, transitions=steps)
+        return accepted
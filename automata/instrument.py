@@ -0,0 +1,126 @@
+# automata/instrument.py
+"""Instrumentación opcional de ejecuciones, validaciones y dibujo.
+
+Desactivada por defecto: el código instrumentado solo consulta ``ENABLED``
+una vez por llamada (nunca por carácter). Se activa con ``enable()`` o con
+la variable de entorno ``AUTOMATA_PROFILE=1``; ``AUTOMATA_PROFILE=cprofile``
+además arranca ``cProfile``. Si también se define ``AUTOMATA_PROFILE_OUT``,
+al salir se escribe ``<ruta>.json`` (y ``<ruta>.prof`` con cProfile).
+
+Lo recogido se exporta con ``dump_json`` o, en formato de ``pstats``, con
+``dump_profile``::
+
+    python -m pstats perfil.prof
+"""
+import atexit
+import cProfile
+import json
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+ENABLED = False
+clock = time.perf_counter
+
+class Timer:
+    __slots__ = ("count", "total", "max", "counts")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.counts = Counter()
+
+    def add(self, seconds: float, counts: Dict[str, int]):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.counts.update(counts)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "total_ms": self.total * 1000,
+            "mean_ms": self.total * 1000 / self.count if self.count else 0.0,
+            "max_ms": self.max * 1000,
+            **self.counts,
+        }
+
+timers: Dict[str, Timer] = {}
+# (State, símbolo) -> veces que se tomó esa transición
+transition_hits: Counter = Counter()
+_profiler: Optional[cProfile.Profile] = None
+
+def enable(profile: bool = False) -> None:
+    global ENABLED, _profiler
+    ENABLED = True
+    if profile and _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+    if _profiler is not None:
+        _profiler.disable()
+
+def reset() -> None:
+    global _profiler
+    timers.clear()
+    transition_hits.clear()
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler = cProfile.Profile()
+        if ENABLED:
+            _profiler.enable()
+
+def record(name: str, seconds: float, **counts) -> None:
+    timer = timers.get(name)
+    if timer is None:
+        timer = timers[name] = Timer()
+    timer.add(seconds, counts)
+
+@contextmanager
+def timed(name: str, **counts):
+    if not ENABLED:
+        yield
+        return
+    t0 = clock()
+    try:
+        yield
+    finally:
+        record(name, clock() - t0, **counts)
+
+def snapshot(top: int = 100) -> dict:
+    return {
+        "timers": {name: timer.as_dict() for name, timer in sorted(timers.items())},
+        "transitions": [
+            {"from": state.name, "symbol": symbol, "hits": hits}
+            for (state, symbol), hits in transition_hits.most_common(top)
+        ],
+    }
+
+def dump_json(path, top: int = 100) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(snapshot(top), fh, ensure_ascii=False, indent=1)
+
+def dump_profile(path) -> None:
+    """Escribe las estadísticas de cProfile (requiere ``enable(profile=True)``)."""
+    if _profiler is None:
+        raise RuntimeError("cProfile no está activo: usa enable(profile=True).")
+    _profiler.dump_stats(path)
+
+def _dump_at_exit(base: str) -> None:
+    dump_json(base + ".json")
+    if _profiler is not None:
+        _profiler.disable()
+        dump_profile(base + ".prof")
+
+_mode = os.environ.get("AUTOMATA_PROFILE", "")
+if _mode:
+    enable(profile=_mode == "cprofile")
+    if os.environ.get("AUTOMATA_PROFILE_OUT"):
+        atexit.register(_dump_at_exit, os.environ["AUTOMATA_PROFILE_OUT"])
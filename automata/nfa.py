@@ -0,0 +1,291 @@
+# automata/nfa.py
+"""AFN con transiciones ε, compilador de expresiones regulares y
+determinización perezosa.
+
+``compile_regex`` construye un AFN de Thompson para la sintaxis::
+
+    a        literal            \\*      literal escapado
+    .        cualquier símbolo  [ab] [a-c]  clase de símbolos
+    xy       concatenación      x|y      alternativa
+    x* x+ x? repeticiones       ( )      agrupación ("()" es ε)
+
+``LazyDFA`` ejecuta el AFN construyendo estados del AFD (conjuntos de
+estados del AFN) solo cuando la entrada los visita, con una caché LRU
+acotada; así un patrón grande corre a velocidad de AFD sin la explosión
+exponencial de la construcción por subconjuntos completa.
+"""
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from automata.dfa import DFA
+
+EPSILON = None
+
+class NFA:
+    def __init__(self, alphabet: Iterable[str] = ()):
+        self.alphabet: Set[str] = set(alphabet)
+        self.moves: List[Dict[str, Set[int]]] = []
+        self.epsilon: List[Set[int]] = []
+        self.start = 0
+        self.accept: Set[int] = set()
+        self._lazy: Optional["LazyDFA"] = None
+
+    def add_state(self) -> int:
+        self.moves.append({})
+        self.epsilon.append(set())
+        return len(self.moves) - 1
+
+    def add_transition(self, frm: int, symbol: Optional[str], to: int) -> None:
+        """``symbol=None`` (``EPSILON``) agrega una transición ε."""
+        if symbol is EPSILON:
+            self.epsilon[frm].add(to)
+        else:
+            self.alphabet.add(symbol)
+            self.moves[frm].setdefault(symbol, set()).add(to)
+        self._lazy = None
+
+    def closure(self, states: Iterable[int]) -> FrozenSet[int]:
+        stack = list(states)
+        seen = set(stack)
+        while stack:
+            s = stack.pop()
+            for to in self.epsilon[s]:
+                if to not in seen:
+                    seen.add(to)
+                    stack.append(to)
+        return frozenset(seen)
+
+    def step(self, states: FrozenSet[int], symbol: str) -> FrozenSet[int]:
+        targets = set()
+        for s in states:
+            targets.update(self.moves[s].get(symbol, ()))
+        return self.closure(targets)
+
+    def lazy(self, cache_size: int = 1024) -> "LazyDFA":
+        return LazyDFA(self, cache_size)
+
+    def run(self, input_str: str) -> bool:
+        if self._lazy is None:
+            self._lazy = self.lazy()
+        return self._lazy.run(input_str)
+
+    def determinize(self, max_states: int = 10000) -> DFA:
+        """Construcción por subconjuntos completa (solo alcanzables).
+
+        Lanza ``ValueError`` si se superan ``max_states`` estados; para esos
+        casos conviene ``lazy()``.
+        """
+        symbols = sorted(self.alphabet)
+        first = self.closure([self.start])
+        names = {first: "d0"}
+        order = [first]
+        dfa = DFA(alphabet=set(symbols))
+        dfa.add_state("d0", is_start=True, is_accept=bool(first & self.accept))
+        for current in order:
+            for sym in symbols:
+                nxt = self.step(current, sym)
+                if not nxt:
+                    continue
+                if nxt not in names:
+                    if len(order) >= max_states:
+                        raise ValueError(f"La determinización supera {max_states} estados.")
+                    names[nxt] = f"d{len(order)}"
+                    order.append(nxt)
+                    dfa.add_state(names[nxt], is_accept=bool(nxt & self.accept))
+                dfa.set_transition(dfa.state_named(names[current]), sym, dfa.state_named(names[nxt]))
+        return dfa
+
+class _Node:
+    __slots__ = ("accepting", "next")
+
+    def __init__(self, accepting: bool):
+        self.accepting = accepting
+        self.next: Dict[str, FrozenSet[int]] = {}
+
+class LazyDFA:
+    """AFD construido bajo demanda con a lo sumo ``cache_size`` estados en memoria.
+
+    Las transiciones guardan el conjunto destino (no el nodo), de modo que
+    expulsar un estado de la caché nunca deja referencias colgando: si se
+    vuelve a visitar, se reconstruye.
+    """
+
+    def __init__(self, nfa: NFA, cache_size: int = 1024):
+        if cache_size < 1:
+            raise ValueError("cache_size debe ser al menos 1.")
+        self.nfa = nfa
+        self.cache_size = cache_size
+        self.cache: "OrderedDict[FrozenSet[int], _Node]" = OrderedDict()
+        self.start = nfa.closure([nfa.start])
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _node(self, key: FrozenSet[int]) -> _Node:
+        node = self.cache.get(key)
+        if node is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            return node
+        self.misses += 1
+        node = _Node(bool(key & self.nfa.accept))
+        self.cache[key] = node
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.evictions += 1
+        return node
+
+    def run_state(self, input_str: str) -> FrozenSet[int]:
+        current = self.start
+        node = self._node(current)
+        for ch in input_str:
+            nxt = node.next.get(ch)
+            if nxt is None:
+                nxt = self.nfa.step(current, ch)
+                node.next[ch] = nxt
+            if not nxt:
+                return nxt
+            current = nxt
+            node = self._node(current)
+        return current
+
+    def run(self, input_str: str) -> bool:
+        return bool(self.run_state(input_str) & self.nfa.accept)
+
+    def stats(self) -> Dict[str, int]:
+        return {"cached": len(self.cache), "capacity": self.cache_size,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+# ---------------- EXPRESIONES REGULARES ----------------
+_SPECIAL = set("|*+?()[].\\")
+
+class _Parser:
+    def __init__(self, pattern: str, nfa: NFA, alphabet: Optional[Set[str]]):
+        self.pattern = pattern
+        self.pos = 0
+        self.nfa = nfa
+        self.alphabet = alphabet
+
+    def error(self, msg: str):
+        return ValueError(f"{msg} en la posición {self.pos} de {self.pattern!r}")
+
+    def peek(self) -> Optional[str]:
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def take(self) -> str:
+        ch = self.pattern[self.pos]
+        self.pos += 1
+        return ch
+
+    def symbols(self, chars: Iterable[str]) -> Tuple[int, int]:
+        chars = set(chars)
+        if self.alphabet is not None and not chars <= self.alphabet:
+            raise self.error(f"Símbolos fuera del alfabeto {sorted(chars - self.alphabet)}")
+        start, end = self.nfa.add_state(), self.nfa.add_state()
+        for ch in chars:
+            self.nfa.add_transition(start, ch, end)
+        return start, end
+
+    def empty(self) -> Tuple[int, int]:
+        start, end = self.nfa.add_state(), self.nfa.add_state()
+        self.nfa.add_transition(start, EPSILON, end)
+        return start, end
+
+    def parse(self) -> Tuple[int, int]:
+        frag = self.alternation()
+        if self.peek() is not None:
+            raise self.error("Carácter inesperado")
+        return frag
+
+    def alternation(self) -> Tuple[int, int]:
+        options = [self.concatenation()]
+        while self.peek() == "|":
+            self.take()
+            options.append(self.concatenation())
+        if len(options) == 1:
+            return options[0]
+        start, end = self.nfa.add_state(), self.nfa.add_state()
+        for s, e in options:
+            self.nfa.add_transition(start, EPSILON, s)
+            self.nfa.add_transition(e, EPSILON, end)
+        return start, end
+
+    def concatenation(self) -> Tuple[int, int]:
+        frag = None
+        while self.peek() is not None and self.peek() not in "|)":
+            nxt = self.repetition()
+            if frag is None:
+                frag = nxt
+            else:
+                self.nfa.add_transition(frag[1], EPSILON, nxt[0])
+                frag = (frag[0], nxt[1])
+        return frag if frag is not None else self.empty()
+
+    def repetition(self) -> Tuple[int, int]:
+        frag = self.atom()
+        while self.peek() in ("*", "+", "?"):
+            op = self.take()
+            start, end = self.nfa.add_state(), self.nfa.add_state()
+            self.nfa.add_transition(start, EPSILON, frag[0])
+            self.nfa.add_transition(frag[1], EPSILON, end)
+            if op in "*?":
+                self.nfa.add_transition(start, EPSILON, end)
+            if op in "*+":
+                self.nfa.add_transition(frag[1], EPSILON, frag[0])
+            frag = (start, end)
+        return frag
+
+    def atom(self) -> Tuple[int, int]:
+        ch = self.peek()
+        if ch in ("*", "+", "?"):
+            raise self.error("Repetición sin operando")
+        self.take()
+        if ch == "(":
+            frag = self.alternation()
+            if self.peek() != ")":
+                raise self.error("Falta ')'")
+            self.take()
+            return frag
+        if ch == "[":
+            return self.symbols(self.char_class())
+        if ch == ".":
+            if self.alphabet is None:
+                raise self.error("'.' requiere un alfabeto explícito")
+            return self.symbols(self.alphabet)
+        if ch == "\\":
+            if self.peek() is None:
+                raise self.error("Escape incompleto")
+            return self.symbols(self.take())
+        if ch in _SPECIAL:
+            raise self.error(f"Carácter especial {ch!r} sin escapar")
+        return self.symbols(ch)
+
+    def char_class(self) -> Set[str]:
+        chars = set()
+        while self.peek() not in ("]", None):
+            lo = self.take()
+            if lo == "\\":
+                if self.peek() is None:
+                    raise self.error("Escape incompleto")
+                lo = self.take()
+            if self.peek() == "-" and self.pos + 1 < len(self.pattern) and self.pattern[self.pos + 1] != "]":
+                self.take()
+                hi = self.take()
+                chars.update(chr(c) for c in range(ord(lo), ord(hi) + 1))
+            else:
+                chars.add(lo)
+        if self.peek() is None:
+            raise self.error("Falta ']'")
+        self.take()
+        if not chars:
+            raise self.error("Clase vacía")
+        return chars
+
+def compile_regex(pattern: str, alphabet: Optional[Iterable[str]] = None) -> NFA:
+    """AFN de Thompson que acepta exactamente las cadenas que encajan completas."""
+    alphabet = set(alphabet) if alphabet is not None else None
+    nfa = NFA(alphabet or ())
+    start, end = _Parser(pattern, nfa, alphabet).parse()
+    nfa.start = start
+    nfa.accept = {end}
+    return nfa
@@ -0,0 +1,165 @@
+# automata/storage.py
+"""Guardado y carga de autómatas junto con la posición de sus estados.
+
+Hay dos formatos:
+
+* JSON legible (``save_json``/``load_json``)::
+
+    {"alphabet": ["a", "b"], "states": ["q0", "q1"], "start": "q0",
+     "accept": ["q1"], "transitions": [["q0", "a", "q1"], ...],
+     "positions": {"q0": [120, 80], ...}}
+
+* Binario compacto (``save_binary``/``load_binary``): una cabecera fija y
+  arreglos de ancho fijo (posiciones float64, símbolos, tabla de
+  transiciones int32 ya compilada, aceptación y nombres). ``load_binary``
+  hace ``mmap`` del archivo y devuelve un ``CompiledDFA`` que ejecuta
+  directamente sobre esos bytes; los ``State`` solo se crean si se piden.
+  Desde la versión 2 la cabecera guarda el CRC-32 de todo lo que la sigue,
+  así que un archivo dañado se rechaza aunque conserve su tamaño.
+"""
+import json
+import math
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Optional, Tuple
+
+from automata.dfa import DFA, CompiledDFA, NameTable, State
+
+Positions = Dict[State, Tuple[float, float]]
+
+MAGIC = b"AFDB"
+VERSION = 2
+# La versión 1 no tenía suma de verificación (el último campo iba en 0).
+_READABLE_VERSIONS = (1, 2)
+HAS_POSITIONS = 1
+# magic, versión, flags, n estados, n símbolos, inicial, bytes de nombres, CRC-32 del resto
+_HEADER = struct.Struct("<4sHHIIIII")
+_HEADER_SIZE = 32
+
+# ---------------- JSON ----------------
+def to_dict(dfa: DFA, positions: Optional[Positions] = None) -> dict:
+    states = sorted(dfa.states, key=lambda s: s.name)
+    data = {
+        "alphabet": sorted(dfa.alphabet),
+        "states": [s.name for s in states],
+        "start": dfa.start.name if dfa.start else None,
+        "accept": sorted(s.name for s in dfa.accept),
+        "transitions": sorted([frm.name, sym, to.name] for (frm, sym), to in dfa.transitions.items()),
+    }
+    if positions:
+        data["positions"] = {s.name: list(positions[s]) for s in states if s in positions}
+    return data
+
+def from_dict(data: dict) -> Tuple[DFA, Positions]:
+    dfa = DFA(alphabet=set(data["alphabet"]))
+    states = {name: dfa.add_state(name) for name in data["states"]}
+    if data.get("start") is not None:
+        dfa.set_start(states[data["start"]])
+    for name in data.get("accept", []):
+        dfa.set_accept(states[name])
+    for frm, sym, to in data.get("transitions", []):
+        dfa.set_transition(states[frm], sym, states[to])
+    positions = {states[name]: tuple(xy) for name, xy in data.get("positions", {}).items()}
+    return dfa, positions
+
+def save_json(path, dfa: DFA, positions: Optional[Positions] = None) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(to_dict(dfa, positions), fh, ensure_ascii=False, indent=1)
+
+def load_json(path) -> Tuple[DFA, Positions]:
+    with open(path, encoding="utf-8") as fh:
+        return from_dict(json.load(fh))
+
+# ---------------- BINARIO ----------------
+def _little(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _view(buf, start: int, count: int, typecode: str):
+    size = array(typecode).itemsize
+    view = buf[start:start + count * size]
+    if sys.byteorder != "little":
+        values = array(typecode, bytes(view))
+        values.byteswap()
+        return values
+    return view.cast(typecode)
+
+def save_binary(path, dfa: DFA, positions: Optional[Positions] = None) -> None:
+    compiled = dfa.compile()
+    n = len(compiled.states)
+    names = [s.name.encode("utf-8") for s in compiled.states]
+    offsets = array("I", [0])
+    for name in names:
+        offsets.append(offsets[-1] + len(name))
+    blob = b"".join(names)
+    flags = HAS_POSITIONS if positions else 0
+    parts = []
+    if positions:
+        coords = array("d")
+        for s in compiled.states:
+            coords.extend(positions.get(s, (math.nan, math.nan)))
+        parts.append(_little(coords))
+    parts += [_little(array("I", [ord(sym) for sym in compiled.symbols])), _little(compiled.table),
+              _little(offsets), bytes(compiled.accepting), blob]
+    crc = 0
+    for part in parts:
+        crc = zlib.crc32(part, crc)
+    with open(path, "wb") as fh:
+        fh.write(_HEADER.pack(MAGIC, VERSION, flags, n, len(compiled.symbols),
+                              compiled.start, len(blob), crc).ljust(_HEADER_SIZE, b"\0"))
+        for part in parts:
+            fh.write(part)
+
+def load_binary(path):
+    """Devuelve ``(CompiledDFA, posiciones)``.
+
+    ``posiciones`` es ``None`` o una vista float64 con ``x, y`` intercalados
+    en el orden de los ids de estado.
+    """
+    with open(path, "rb") as fh:
+        buf = memoryview(mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ))
+    if len(buf) < _HEADER_SIZE:
+        raise ValueError(f"Archivo binario truncado: {path}")
+    magic, version, flags, n, k, start, blob_size, crc = _HEADER.unpack_from(buf)
+    if magic != MAGIC or version not in _READABLE_VERSIONS:
+        raise ValueError(f"No es un autómata binario compatible: {path}")
+    width = k + 1
+    expected = (_HEADER_SIZE + (16 * n if flags & HAS_POSITIONS else 0) + 4 * k
+                + 4 * (n + 1) * width + 4 * (n + 1) + (n + 1) + blob_size)
+    if len(buf) != expected:
+        raise ValueError(f"Archivo binario truncado o dañado ({len(buf)} de {expected} bytes): {path}")
+    if version >= 2 and zlib.crc32(buf[_HEADER_SIZE:]) != crc:
+        raise ValueError(f"Archivo binario dañado (no coincide el CRC-32): {path}")
+    if start >= n:
+        raise ValueError(f"Estado inicial fuera de rango: {path}")
+    pos = _HEADER_SIZE
+    positions = None
+    if flags & HAS_POSITIONS:
+        positions = _view(buf, pos, 2 * n, "d")
+        pos += 16 * n
+    symbols = tuple(chr(c) for c in _view(buf, pos, k, "I"))
+    pos += 4 * k
+    table = _view(buf, pos, (n + 1) * width, "i")
+    pos += 4 * (n + 1) * width
+    offsets = _view(buf, pos, n + 1, "I")
+    pos += 4 * (n + 1)
+    accepting = buf[pos:pos + n + 1]
+    pos += n + 1
+    if offsets[n] != blob_size:
+        raise ValueError(f"Tabla de nombres dañada: {path}")
+    states = NameTable(offsets, buf[pos:pos + blob_size])
+    return CompiledDFA(states, symbols, table, start, accepting), positions
+
+def positions_by_state(compiled: CompiledDFA, coords) -> Positions:
+    # Pasa la vista plana de load_binary al diccionario que usa la interfaz.
+    out = {}
+    for i, state in enumerate(compiled.states):
+        x, y = coords[2 * i], coords[2 * i + 1]
+        if not (math.isnan(x) or math.isnan(y)):
+            out[state] = (x, y)
+    return out
@@ -0,0 +1,110 @@
+# automata/stream.py
+"""Ejecución incremental de un ``CompiledDFA`` sobre flujos de bytes.
+
+La entrada se consume por trozos: cada bloque de bytes se pasa a índices de
+columna con ``bytes.translate`` y una tabla de 256 entradas (cada byte se
+toma como el carácter latin-1 del mismo código) y luego avanza sobre la
+tabla densa del autómata. El recorrido se detiene en cuanto se cae al sumidero y
+el estado actual puede guardarse como *checkpoint* para continuar después,
+por ejemplo sobre un archivo que sigue creciendo.
+
+``consumed`` cuenta bytes si se alimentó con bytes y caracteres si se alimentó
+con str; el runner (y su checkpoint) recuerda la unidad, no deja mezclarlas y
+``feed_file`` solo reanuda desde un desplazamiento en bytes.
+"""
+import mmap
+import os
+
+BLOCK = 1 << 16     # bytes procesados entre comprobaciones del sumidero
+CHUNK = 1 << 20     # bytes leídos por llamada a read()
+
+class StreamRunner:
+    def __init__(self, compiled, state=None, consumed: int = 0, unit=None):
+        self.compiled = compiled
+        self.width = compiled.width
+        self.byte_columns = compiled.byte_columns()
+        self.dead_row = compiled.dead * self.width
+        self.row = (compiled.start if state is None else state) * self.width
+        self.consumed = consumed
+        self.unit = unit    # "bytes", "chars" o None mientras no se consuma nada
+
+    @property
+    def dead(self) -> bool:
+        return self.row == self.dead_row
+
+    @property
+    def state_id(self) -> int:
+        return self.row // self.width
+
+    def feed(self, chunk) -> bool:
+        """Consume ``chunk`` (bytes o str). Devuelve False si ya no hay salida."""
+        text = isinstance(chunk, str)
+        unit = "chars" if text else "bytes"
+        if self.unit is None:
+            self.unit = unit
+        elif self.unit != unit:
+            raise ValueError("No se pueden mezclar trozos str y bytes en la misma ejecución.")
+        if self.dead:
+            return False
+        table = self.compiled.table
+        columns = self.byte_columns
+        dead_row = self.dead_row
+        view = chunk if text else memoryview(chunk)
+        for start in range(0, len(view), BLOCK):
+            row = self.row
+            block = view[start:start + BLOCK]
+            if text:
+                cols = self.compiled.encode(block)
+            elif isinstance(columns, bytes):
+                cols = bytes(block).translate(columns)
+            else:
+                cols = [columns[b] for b in block]
+            for col in cols:
+                row = table[row + col]
+            self.row = row
+            if row == dead_row:
+                # El resto de la entrada ya no puede cambiar el resultado.
+                self.consumed += start + len(block)
+                return False
+        self.consumed += len(view)
+        return True
+
+    def result(self) -> bool:
+        return bool(self.compiled.accepting[self.state_id])
+
+    def state(self):
+        return self.compiled.state_of(self.state_id)
+
+    def checkpoint(self) -> dict:
+        return {"state": self.state_id, "consumed": self.consumed, "unit": self.unit,
+                "fingerprint": self.compiled.fingerprint()}
+
+    @classmethod
+    def resume(cls, compiled, checkpoint: dict) -> "StreamRunner":
+        if checkpoint["fingerprint"] != compiled.fingerprint():
+            raise ValueError("El checkpoint pertenece a otro autómata.")
+        return cls(compiled, checkpoint["state"], checkpoint["consumed"], checkpoint.get("unit"))
+
+    def feed_file(self, path, chunk_size: int = CHUNK, use_mmap: bool = False) -> bool:
+        """Consume el archivo a partir de ``consumed`` (para poder reanudar)."""
+        if self.unit == "chars":
+            raise ValueError("El avance está en caracteres (se alimentó con str); "
+                             "no sirve como posición en el archivo.")
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if self.consumed >= size:
+                return not self.dead
+            if use_mmap:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    view = memoryview(mm)
+                    try:
+                        return self.feed(view[self.consumed:])
+                    finally:
+                        view.release()
+            fh.seek(self.consumed)
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    return not self.dead
+                if not self.feed(chunk):
+                    return False
@@ -0,0 +1,178 @@
+# automata/structure.py
+"""Índice estructural de un DFA que se mantiene de forma incremental.
+
+Guarda el mapa nombre→estado, la adyacencia hacia adelante y hacia atrás
+(con multiplicidad, porque varios símbolos pueden unir el mismo par), los
+conjuntos de estados alcanzables desde el inicial y co-alcanzables (que
+llegan a un estado de aceptación) y cuántas transiciones faltan. Cada
+operación recorre solo la región afectada del grafo.
+"""
+from collections import deque
+from typing import Dict, Iterable, Optional, Set
+
+class StructureIndex:
+    def __init__(self, alphabet_size: int):
+        self.alphabet_size = alphabet_size
+        self.by_name: Dict[str, object] = {}
+        self.succ: Dict[object, Dict[object, int]] = {}
+        self.pred: Dict[object, Dict[object, int]] = {}
+        self.out_degree: Dict[object, int] = {}
+        self.start = None
+        self.accept: Set[object] = set()
+        self.reachable: Set[object] = set()
+        self.coreachable: Set[object] = set()
+        self.missing = 0
+
+    @classmethod
+    def build(cls, dfa) -> "StructureIndex":
+        index = cls(len(dfa.alphabet))
+        for s in dfa.states:
+            index.add_state(s)
+        for s in dfa.accept:
+            index.set_accept(s, True)
+        for (frm, _), to in dfa.transitions.items():
+            index.add_state(frm)
+            index.add_state(to)
+            index.add_edge(frm, to)
+        if dfa.start is not None:
+            index.add_state(dfa.start)
+            index.set_start(dfa.start)
+        return index
+
+    # ---------------- CONSULTAS ----------------
+    def state_named(self, name: str):
+        return self.by_name.get(name)
+
+    def missing_for(self, state) -> int:
+        return self.alphabet_size - self.out_degree.get(state, 0)
+
+    @property
+    def is_complete(self) -> bool:
+        return self.missing == 0
+
+    def unreachable(self) -> Set[object]:
+        return set(self.succ) - self.reachable
+
+    def dead(self) -> Set[object]:
+        """Estados desde los que no se llega a ningún estado de aceptación."""
+        return set(self.succ) - self.coreachable
+
+    def summary(self) -> Dict[str, int]:
+        n = len(self.succ)
+        return {
+            "states": n,
+            "unreachable": n - len(self.reachable),
+            "dead": n - len(self.coreachable),
+            "missing": self.missing,
+        }
+
+    # ---------------- MODIFICACIONES ----------------
+    def add_state(self, state) -> None:
+        if state in self.succ:
+            return
+        self.by_name[state.name] = state
+        self.succ[state] = {}
+        self.pred[state] = {}
+        self.out_degree[state] = 0
+        self.missing += self.alphabet_size
+
+    def remove_state(self, state) -> None:
+        for to in list(self.succ[state]):
+            for _ in range(self.succ[state][to]):
+                self.remove_edge(state, to)
+        for frm in list(self.pred[state]):
+            for _ in range(self.pred[state][frm]):
+                self.remove_edge(frm, state)
+        self.set_accept(state, False)
+        if self.start == state:
+            self.set_start(None)
+        del self.succ[state], self.pred[state], self.by_name[state.name]
+        self.reachable.discard(state)
+        self.coreachable.discard(state)
+        self.missing -= self.alphabet_size - self.out_degree.pop(state)
+
+    def set_start(self, state) -> None:
+        # Cambiar el inicial puede afectar a todo: se recalcula desde cero.
+        self.start = state
+        self.reachable = set()
+        if state is not None:
+            self._forward_from([state], self.reachable)
+
+    def set_accept(self, state, accepting: bool) -> None:
+        if accepting:
+            if state not in self.accept:
+                self.accept.add(state)
+                self._backward_from([state], self.coreachable)
+        elif state in self.accept:
+            self.accept.discard(state)
+            self._retract_coreachable(state)
+
+    def add_edge(self, frm, to) -> None:
+        self.out_degree[frm] += 1
+        self.missing -= 1
+        row = self.succ[frm]
+        row[to] = row.get(to, 0) + 1
+        col = self.pred[to]
+        col[frm] = col.get(frm, 0) + 1
+        if row[to] > 1:
+            return
+        if frm in self.reachable and to not in self.reachable:
+            self._forward_from([to], self.reachable)
+        if to in self.coreachable and frm not in self.coreachable:
+            self._backward_from([frm], self.coreachable)
+
+    def remove_edge(self, frm, to) -> None:
+        self.out_degree[frm] -= 1
+        self.missing += 1
+        row = self.succ[frm]
+        row[to] -= 1
+        self.pred[to][frm] -= 1
+        if row[to]:
+            return
+        del row[to]
+        del self.pred[to][frm]
+        if to in self.reachable and to != self.start:
+            self._retract_reachable(to)
+        if frm in self.coreachable and frm not in self.accept:
+            self._retract_coreachable(frm)
+
+    # ---------------- RECORRIDOS ----------------
+    def _forward_from(self, seeds: Iterable[object], marked: Set[object], within: Optional[Set[object]] = None):
+        queue = deque(s for s in seeds if s not in marked)
+        marked.update(queue)
+        while queue:
+            s = queue.popleft()
+            for to in self.succ[s]:
+                if to not in marked and (within is None or to in within):
+                    marked.add(to)
+                    queue.append(to)
+
+    def _backward_from(self, seeds: Iterable[object], marked: Set[object], within: Optional[Set[object]] = None):
+        queue = deque(s for s in seeds if s not in marked)
+        marked.update(queue)
+        while queue:
+            s = queue.popleft()
+            for frm in self.pred[s]:
+                if frm not in marked and (within is None or frm in within):
+                    marked.add(frm)
+                    queue.append(frm)
+
+    def _retract_reachable(self, root) -> None:
+        # Región afectada: descendientes alcanzables de root. Se quitan y se
+        # vuelven a marcar solo los que conservan un predecesor alcanzable.
+        region: Set[object] = set()
+        self._forward_from([root], region, within=self.reachable)
+        self.reachable -= region
+        seeds = [s for s in region if s == self.start or any(p in self.reachable for p in self.pred[s])]
+        restored: Set[object] = set()
+        self._forward_from(seeds, restored, within=region)
+        self.reachable |= restored
+
+    def _retract_coreachable(self, root) -> None:
+        region: Set[object] = set()
+        self._backward_from([root], region, within=self.coreachable)
+        self.coreachable -= region
+        seeds = [s for s in region if s in self.accept or any(t in self.coreachable for t in self.succ[s])]
+        restored: Set[object] = set()
+        self._backward_from(seeds, restored, within=region)
+        self.coreachable |= restored
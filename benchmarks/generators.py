@@ -0,0 +1,34 @@
+# benchmarks/generators.py
+"""Generadores deterministas (con semilla) de autómatas y cadenas de prueba."""
+import random
+from typing import List
+
+from automata.dfa import DFA
+
+def make_alphabet(size: int) -> List[str]:
+    # Caracteres imprimibles ASCII y luego latin-1/latin extendido: hasta 256+.
+    return [chr(0x21 + i) if i < 94 else chr(0xA1 + i - 94) for i in range(size)]
+
+def random_dfa(n_states: int, n_symbols: int, seed: int = 0,
+               density: float = 1.0, accept_ratio: float = 0.5) -> DFA:
+    """AFD aleatorio; ``density`` es la fracción de transiciones definidas."""
+    rng = random.Random(seed)
+    alphabet = make_alphabet(n_symbols)
+    dfa = DFA(alphabet=set(alphabet))
+    states = [dfa.add_state(f"q{i}") for i in range(n_states)]
+    dfa.set_start(states[0])
+    for s in states:
+        if rng.random() < accept_ratio:
+            dfa.set_accept(s)
+        for sym in alphabet:
+            if density >= 1.0 or rng.random() < density:
+                dfa.set_transition(s, sym, states[rng.randrange(n_states)])
+    return dfa
+
+def corpus(alphabet, count: int, length: int, seed: int = 0, jitter: float = 0.5) -> List[str]:
+    """``count`` cadenas de longitud ``length`` ± ``jitter``·``length``."""
+    rng = random.Random(seed)
+    symbols = sorted(alphabet)
+    lo = max(0, int(length * (1 - jitter)))
+    hi = int(length * (1 + jitter))
+    return ["".join(rng.choices(symbols, k=rng.randint(lo, hi))) for _ in range(count)]
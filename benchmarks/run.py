@@ -0,0 +1,186 @@
+# benchmarks/run.py
+"""Mide los caminos críticos del motor, los validadores y el dibujo.
+
+Uso::
+
+    python -m benchmarks.run -o resultados.json
+    python -m benchmarks.run --quick --suite run,redraw
+
+Cada medición se repite ``--repeat`` veces y se guarda el mejor tiempo.
+Los resultados (más datos de la máquina) se escriben como JSON para poder
+comparar corridas.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from automata.dfa import DFA, np
+from benchmarks.generators import corpus, random_dfa
+from benchmarks.stub_canvas import StubCanvas, StubLabel
+from engine.level_rules import LEVELS
+
+FULL = {
+    "states": [10, 1000, 100000],
+    "symbols": [2, 16, 256],
+    "words": 2000,
+    "length": 200,
+    "validate_states": [10, 100, 1000],
+    "redraw_states": [10, 100, 1000],
+}
+QUICK = {
+    "states": [10, 1000],
+    "symbols": [2, 16],
+    "words": 200,
+    "length": 50,
+    "validate_states": [10, 100],
+    "redraw_states": [10, 100],
+}
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def record(results, suite, name, params, seconds, work=None, unit=None):
+    entry = {"suite": suite, "name": name, "params": params, "seconds": seconds}
+    if work:
+        entry["throughput"] = work / seconds if seconds else None
+        entry["unit"] = unit
+    results.append(entry)
+    print(f"{suite:9} {name:22} {json.dumps(params):48} {seconds * 1000:10.3f} ms", file=sys.stderr)
+
+# ---------------- SUITES ----------------
+def bench_run(cfg, args, results):
+    for n in cfg["states"]:
+        for k in cfg["symbols"]:
+            if n * k > args.max_transitions:
+                continue
+            dfa = random_dfa(n, k, seed=args.seed)
+            words = corpus(dfa.alphabet, cfg["words"], cfg["length"], seed=args.seed)
+            chars = sum(map(len, words))
+            params = {"states": n, "symbols": k, "words": len(words), "chars": chars}
+            t = best_time(lambda: dfa.invalidate() or dfa.compile(), args.repeat)
+            record(results, "run", "compile", params, t)
+            compiled = dfa.compile()
+            t = best_time(lambda: [dfa.run(w) for w in words], args.repeat)
+            record(results, "run", "DFA.run", params, t, chars, "chars/s")
+            t = best_time(lambda: [compiled.run(w) for w in words], args.repeat)
+            record(results, "run", "CompiledDFA.run", params, t, chars, "chars/s")
+
+def bench_batch(cfg, args, results):
+    for n in cfg["states"]:
+        k = 2
+        dfa = random_dfa(n, k, seed=args.seed)
+        compiled = dfa.compile()
+        for count in (cfg["words"], cfg["words"] * 10):
+            words = corpus(dfa.alphabet, count, cfg["length"], seed=args.seed)
+            chars = sum(map(len, words))
+            params = {"states": n, "symbols": k, "words": count, "numpy": np is not None}
+            t = best_time(lambda: [compiled.run(w) for w in words], args.repeat)
+            record(results, "batch", "loop CompiledDFA.run", params, t, chars, "chars/s")
+            t = best_time(lambda: compiled.run_many(words), args.repeat)
+            record(results, "batch", "run_many", params, t, chars, "chars/s")
+
+def bench_validate(cfg, args, results):
+    for n in cfg["validate_states"]:
+        dfas = [random_dfa(n, 2, seed=args.seed + i) for i in range(20)]
+        # Los validadores esperan el alfabeto {a, b}.
+        for dfa in dfas:
+            rename = dict(zip(sorted(dfa.alphabet), "ab"))
+            dfa.alphabet = {"a", "b"}
+            dfa.transitions = {(s, rename[c]): to for (s, c), to in dfa.transitions.items()}
+            dfa.invalidate()
+        params = {"states": n, "automata": len(dfas), "levels": len(LEVELS)}
+        t = best_time(lambda: [lvl.validator(d) for d in dfas for lvl in LEVELS], args.repeat)
+        record(results, "validate", "validator", params, t, len(dfas) * len(LEVELS), "checks/s")
+        for d in dfas:
+            for lvl in LEVELS:
+                lvl.validate(d)
+        t = best_time(lambda: [lvl.validate(d) for d in dfas for lvl in LEVELS], args.repeat)
+        record(results, "validate", "validate (cached)", params, t, len(dfas) * len(LEVELS), "checks/s")
+
+def headless_app(dfa: DFA, positions):
+    # App sin ventana: solo el estado del editor y widgets de mentira.
+    from ui.app_tk import App
+    app = App.__new__(App)
+    app.init_editor_state()
+    app.canvas = StubCanvas()
+    app.diagnostics_label = StubLabel()
+    app.dfa = dfa
+    app.state_positions = positions
+    app.reindex()
+    return app
+
+def bench_redraw(cfg, args, results):
+    rng = random.Random(args.seed)
+    for n in cfg["redraw_states"]:
+        dfa = random_dfa(n, 2, seed=args.seed)
+        positions = {s: (rng.uniform(0, 1200), rng.uniform(0, 800)) for s in dfa.states}
+        app = headless_app(dfa, positions)
+        t = best_time(app.redraw, args.repeat)
+        params = {"states": n, "transitions": len(dfa.transitions), "items": len(app.canvas.items)}
+        record(results, "redraw", "App.redraw", params, t)
+
+        state = dfa.start
+        app.drag_edges = [key for key, to in dfa.transitions.items() if key[0] == state or to == state]
+
+        def drag():
+            for step in range(50):
+                app.state_positions[state] = (100 + step, 100 + step)
+                app.move_state_items(state)
+        t = best_time(drag, args.repeat)
+        record(results, "redraw", "drag step x50", params, t, 50, "steps/s")
+
+        # Con zoom x4 solo se ve 1/16 del lienzo: mide el recorte por vista.
+        app.view_scale = 4.0
+        t = best_time(app.redraw, args.repeat)
+        record(results, "redraw", "App.redraw (zoom x4)", {**params, "items": len(app.canvas.items)}, t)
+        app.view_scale = 1.0
+
+SUITES = {"run": bench_run, "batch": bench_batch, "validate": bench_validate, "redraw": bench_redraw}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("-o", "--output", help="archivo JSON de resultados (por defecto stdout)")
+    parser.add_argument("--suite", default=",".join(SUITES), help="suites separadas por comas")
+    parser.add_argument("--quick", action="store_true", help="tamaños reducidos")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-transitions", type=int, default=2_000_000,
+                        help="omite combinaciones estados×símbolos más grandes")
+    args = parser.parse_args(argv)
+
+    cfg = QUICK if args.quick else FULL
+    results = []
+    for name in args.suite.split(","):
+        SUITES[name](cfg, args, results)
+
+    report = {
+        "meta": {
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "numpy": getattr(np, "__version__", None),
+            "seed": args.seed,
+            "quick": args.quick,
+            "repeat": args.repeat,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
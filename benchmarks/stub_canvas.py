@@ -0,0 +1,79 @@
+# benchmarks/stub_canvas.py
+"""Sustitutos mínimos de widgets Tk para medir el dibujo sin pantalla."""
+import itertools
+
+class StubCanvas:
+    """Imita la parte de ``tk.Canvas`` que usa ``App`` y cuenta las llamadas."""
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.items = {}
+        self.calls = 0
+
+    def _create(self, kind, coords, options):
+        self.calls += 1
+        item = next(self._ids)
+        self.items[item] = (kind, coords, options)
+        return item
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def delete(self, *tags):
+        self.calls += 1
+        for tag in tags:
+            if tag == "all":
+                self.items.clear()
+            elif isinstance(tag, int):
+                self.items.pop(tag, None)
+            else:
+                for item in [i for i, (_, _, o) in self.items.items() if tag in o.get("tags", ())]:
+                    del self.items[item]
+
+    def coords(self, item, *coords):
+        self.calls += 1
+        if coords:
+            kind, _, options = self.items[item]
+            self.items[item] = (kind, coords, options)
+        return list(self.items[item][1])
+
+    def itemconfigure(self, item, **options):
+        self.calls += 1
+        self.items[item][2].update(options)
+
+    itemconfig = itemconfigure
+
+    def move(self, tag, dx, dy):
+        self.calls += 1
+
+    def tag_raise(self, *args):
+        self.calls += 1
+
+    def tag_lower(self, *args):
+        self.calls += 1
+
+    def winfo_width(self):
+        return 1200
+
+    def winfo_height(self):
+        return 800
+
+    def config(self, **options):
+        pass
+
+    configure = config
+
+class StubLabel:
+    def config(self, **options):
+        self.options = options
+
+    configure = config
@@ -0,0 +1,138 @@
+# engine/grade.py
+"""Calificador por lotes sin interfaz gráfica.
+
+Uso::
+
+    python -m engine.grade entregas.jsonl [otra_carpeta/ ...] -o resultados.jsonl
+
+Cada línea de entrada es un objeto JSON con ``id``, ``level`` (número de
+nivel empezando en 1, o su nombre) y ``dfa`` en el formato JSON de
+``automata.storage``.
+
+Las carpetas se recorren buscando ``*.jsonl``. Los resultados salen como
+JSONL (en el mismo orden que la entrada) y las estadísticas van a stderr.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from automata.storage import from_dict
+from engine.level_rules import LEVELS
+
+def find_level(ref):
+    if isinstance(ref, int):
+        if not 1 <= ref <= len(LEVELS):
+            raise ValueError(f"Nivel fuera de rango: {ref}")
+        return LEVELS[ref - 1]
+    lvl = LEVELS.find(ref)
+    if lvl is not None:
+        return lvl
+    raise ValueError(f"Nivel desconocido: {ref!r}")
+
+def grade_line(line: str):
+    t0 = time.perf_counter()
+    sub_id = None
+    try:
+        data = json.loads(line)
+        if not isinstance(data, dict):
+            raise ValueError("cada línea debe ser un objeto JSON")
+        sub_id = data.get("id")
+        lvl = find_level(data["level"])
+        dfa, _ = from_dict(data["dfa"])
+        ok, msgs = lvl.validate(dfa)
+        result = {"id": sub_id, "level": lvl.name, "ok": ok, "messages": msgs}
+    except Exception as e:  # una entrega mal formada es una fila de error, no detiene el lote
+        result = {"id": sub_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    result["ms"] = round((time.perf_counter() - t0) * 1000, 3)
+    return result
+
+def grade_chunk(lines):
+    return [grade_line(line) for line in lines]
+
+def iter_lines(paths):
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.rglob("*.jsonl")) if path.is_dir() else [path]
+        for file in files:
+            with open(file, encoding="utf-8") as fh:
+                for line in fh:
+                    if line.strip():
+                        yield line
+
+def iter_chunks(lines, size):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def grade(paths, workers=None, chunk_size=256):
+    """Genera los resultados en orden, con un número acotado de lotes en vuelo."""
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in iter_chunks(iter_lines(paths), chunk_size):
+            pending.append(pool.submit(grade_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m engine.grade",
+                                     description="Califica entregas de AFD sin abrir la interfaz.")
+    parser.add_argument("inputs", nargs="+", help="archivos JSONL o carpetas con *.jsonl")
+    parser.add_argument("-o", "--output", help="archivo JSONL de salida (por defecto stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="procesos (por defecto, núcleos)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="entregas por lote enviado a cada proceso")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    latencies = []
+    passed = errors = 0
+    t0 = time.perf_counter()
+    try:
+        for result in grade(args.inputs, args.workers, args.chunk_size):
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            latencies.append(result["ms"])
+            passed += result["ok"]
+            errors += "error" in result
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    total = len(latencies)
+    stats = {
+        "submissions": total,
+        "passed": passed,
+        "failed": total - passed - errors,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "per_second": round(total / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / total, 3) if total else 0.0,
+            "p50": _percentile(latencies, 0.50),
+            "p95": _percentile(latencies, 0.95),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+    }
+    print(json.dumps(stats), file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,126 +1,244 @@
-from automata.dfa import DFA
+import hashlib
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import List, Optional
+from automata import analysis, instrument, storage
+from automata.dfa import DFA, CompiledDFA
+from automata.nfa import compile_regex
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11: solo paquetes en JSON
+    tomllib = None
+
+# Resultados de validación por (nivel, hash canónico del AFD mínimo).
+RESULT_CACHE_SIZE = 4096
+_results = OrderedDict()
+# Parte de la clave de la caché en disco de referencias: subirla al cambiar
+# cómo se compilan (regex, determinización, minimización) invalida lo guardado.
+REFERENCE_CACHE_VERSION = 2
+# Longitud usada para comparar conteos con la referencia en los mensajes.
+STATS_LENGTH = 8
 
 class Level:
-    def __init__(self, name, description, objective, alphabet, examples_pos, examples_neg, validator):
+    def __init__(self, name, description, objective, alphabet, examples_pos, examples_neg, validator,
+                 reference=None):
+        # examples_pos/examples_neg pueden ser None: se generan desde la referencia.
         self.name = name
         self.description = description
         self.objective = objective
         self.alphabet = alphabet
-        self.examples_pos = examples_pos
-        self.examples_neg = examples_neg
+        self._examples_pos = examples_pos
+        self._examples_neg = examples_neg
         self.validator = validator
+        self._reference = reference
+
+    @property
+    def examples_pos(self):
+        if self._examples_pos is None:
+            self._generate_examples()
+        return self._examples_pos
+
+    @property
+    def examples_neg(self):
+        if self._examples_neg is None:
+            self._generate_examples()
+        return self._examples_neg
+
+    def _generate_examples(self):
+        # Sin ejemplos escritos a mano se muestrean de la referencia.
+        pos, neg = analysis.example_sets(self.reference, lengths=range(5))
+        if self._examples_pos is None:
+            self._examples_pos = pos[:4]
+        if self._examples_neg is None:
+            self._examples_neg = neg[:4]
+
+    @property
+    def reference(self) -> CompiledDFA | None:
+        # AFD de referencia del nivel, compilado una sola vez.
+        return self._reference() if self._reference else None
+
+    def validate(self, dfa: DFA, cancel=None):
+        """Como ``validator``, pero memoizado para autómatas equivalentes.
+
+        Con ``cancel`` (función sin argumentos) la validación se interrumpe
+        con ``automata.dfa.Cancelled`` en cuanto devuelva True.
+        """
+        if dfa.start is None:
+            return self.validator(dfa)
+        t0 = instrument.clock() if instrument.ENABLED else 0.0
+        key = (self.name, dfa.canonical_hash(cancel))
+        hit = key in _results
+        if hit:
+            _results.move_to_end(key)
+        else:
+            with instrument.timed(f"Level.validator[{self.name}]"):
+                ok, msgs = self.validator(dfa, cancel) if cancel is not None else self.validator(dfa)
+            _results[key] = (ok, tuple(msgs))
+            if len(_results) > RESULT_CACHE_SIZE:
+                _results.popitem(last=False)
+        if instrument.ENABLED:
+            instrument.record(f"Level.validate[{self.name}]", instrument.clock() - t0, cache_hits=int(hit))
+        ok, msgs = _results[key]
+        return ok, list(msgs)
+
+# ---------------- AUTÓMATAS DE REFERENCIA ----------------
+def regex_reference(pattern, alphabet=("a", "b")):
+    """Referencia definida por una expresión regular, compilada al primer uso."""
+    @lru_cache(maxsize=None)
+    def build() -> CompiledDFA:
+        return compile_regex(pattern, alphabet).determinize().compile().minimize()
+    build.pattern = pattern
+    return build
+
+def dfa_reference(data: dict):
+    """Referencia dada como AFD en el formato JSON de ``automata.storage``."""
+    @lru_cache(maxsize=None)
+    def build() -> CompiledDFA:
+        dfa, _ = storage.from_dict(data)
+        return dfa.compile().minimize()
+    return build
 
 # ---------------- VALIDADORES DE NIVELES ----------------
-def validate_level1(dfa: DFA):
-    msgs = []
-    if not dfa.start:
-        msgs.append("Debes marcar un estado inicial.")
-        return False, msgs
-    accepted = all(dfa.run(w) for w in ["a", "ba", "bba"])
-    rejected = all(not dfa.run(w) for w in ["b", "bb", "ab"])
-    if accepted and rejected:
-        return True, []
-    else:
-        msgs.append("El autómata no cumple con el objetivo de terminar en 'a'.")
-        return False, msgs
-
-def validate_level2(dfa: DFA):
-    msgs = []
-    if not dfa.start:
-        msgs.append("Debes marcar un estado inicial.")
-        return False, msgs
-    accepted = all(dfa.run(w) for w in ["b", "ba", "bb"])
-    rejected = all(not dfa.run(w) for w in ["a", "aa", "ab"])
-    if accepted and rejected:
-        return True, []
-    else:
-        msgs.append("El autómata no cumple con el objetivo de empezar con 'b'.")
-        return False, msgs
-
-def validate_level3(dfa: DFA):
-    msgs = []
-    if not dfa.start:
-        msgs.append("Debes marcar un estado inicial.")
-        return False, msgs
-    accepted = all(dfa.run(w) for w in ["ab", "aab", "bab"])
-    rejected = all(not dfa.run(w) for w in ["aa", "bb", "ba"])
-    if accepted and rejected:
-        return True, []
-    else:
-        msgs.append("El autómata no cumple con el objetivo de contener 'ab'.")
-        return False, msgs
-
-def validate_level4(dfa: DFA):
-    msgs = []
-    if not dfa.start:
-        msgs.append("Debes marcar un estado inicial.")
-        return False, msgs
-    accepted = all(dfa.run(w) for w in ["", "aa", "bb", "abba"])
-    rejected = all(not dfa.run(w) for w in ["a", "b", "aba"])
-    if accepted and rejected:
-        return True, []
-    else:
-        msgs.append("El autómata no cumple con el objetivo de longitud par.")
-        return False, msgs
-
-def validate_level5(dfa: DFA):
-    msgs = []
-    if not dfa.start:
-        msgs.append("Debes marcar un estado inicial.")
-        return False, msgs
-    accepted = all(dfa.run(w) for w in ["", "aaa", "baaab"])
-    rejected = all(not dfa.run(w) for w in ["a", "aa", "aab"])
-    if accepted and rejected:
+def _check_reference(dfa: DFA, reference: CompiledDFA, message: str, cancel=None):
+    # Equivalencia exacta: si hay diferencia se muestra la cadena más corta.
+    word = dfa.compile().distinguish(reference, cancel)
+    if word is None:
         return True, []
+    shown = f"'{word}'" if word else "la cadena vacía"
+    # La referencia no es del jugador: sus transiciones no van al mapa de calor.
+    verdict = "aceptada" if reference.run(word, record=False) else "rechazada"
+    stats = analysis.compare(dfa.compile(), reference, STATS_LENGTH, cancel)
+    return False, [message, f"Contraejemplo: {shown} debería ser {verdict}.",
+                   f"Con longitud {STATS_LENGTH}, tu autómata acepta {stats['candidate']} de "
+                   f"{stats['total']} cadenas; la referencia acepta {stats['reference']}."]
+
+def reference_validator(reference, message: str):
+    """Validador que compara contra ``reference()`` y falla con ``message``."""
+    def validator(dfa: DFA, cancel=None):
+        msgs = []
+        if dfa.start is None:
+            msgs.append("Debes marcar un estado inicial.")
+            return False, msgs
+        return _check_reference(dfa, reference(), message, cancel)
+    return validator
+
+# ---------------- PAQUETES DE NIVELES ----------------
+def default_cache_dir() -> str:
+    if os.environ.get("AUTOMATA_CACHE_DIR"):
+        return os.environ["AUTOMATA_CACHE_DIR"]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "juego-automatas")
+
+def _read_data(path: str) -> dict:
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError(f"Leer {path} requiere Python 3.11 o superior (tomllib).")
+        with open(path, "rb") as fh:
+            return tomllib.load(fh)
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+def cached_reference(build, key: str, cache_dir: Optional[str]):
+    """Envuelve ``build`` con una caché en disco (formato ``.afdb``) bajo ``key``.
+
+    Si la carpeta no se puede escribir la referencia se compila igual, solo
+    que sin guardarla.
+    """
+    @lru_cache(maxsize=None)
+    def load() -> CompiledDFA:
+        if cache_dir is None:
+            return build()
+        path = os.path.join(cache_dir, key + ".afdb")
+        try:
+            return storage.load_binary(path)[0]
+        except (OSError, ValueError, struct.error):
+            pass
+        compiled = build()
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            storage.save_binary(tmp, compiled.to_dfa())
+            os.replace(tmp, path)
+        except OSError:
+            pass
+        return compiled
+    return load
+
+def load_level(path: str, cache_dir: Optional[str] = None) -> Level:
+    """Construye un ``Level`` desde un archivo JSON o TOML.
+
+    Campos: ``name``, ``description``, ``objective``, ``alphabet``, ``message``,
+    ``reference`` (``{"regex": ...}`` o ``{"dfa": {...}}``) y, opcionalmente,
+    ``examples_pos``/``examples_neg``.
+    """
+    data = _read_data(path)
+    alphabet = list(data["alphabet"])
+    spec = data["reference"]
+    if "regex" in spec:
+        build = regex_reference(spec["regex"], tuple(alphabet))
+    elif "dfa" in spec:
+        build = dfa_reference(spec["dfa"])
     else:
-        msgs.append("El autómata no cumple con el objetivo de múltiplo de 3 en 'a'.")
-        return False, msgs
+        raise ValueError(f"{path}: 'reference' necesita 'regex' o 'dfa'.")
+    # La clave depende solo de lo que define la referencia, no de textos o ejemplos.
+    content = json.dumps({"format": storage.VERSION, "compiler": REFERENCE_CACHE_VERSION,
+                          "alphabet": alphabet, "reference": spec}, sort_keys=True, ensure_ascii=False)
+    key = hashlib.sha1(content.encode("utf-8")).hexdigest()
+    reference = cached_reference(build, key, cache_dir)
+    return Level(
+        name=data["name"],
+        description=data["description"],
+        objective=data["objective"],
+        alphabet=alphabet,
+        examples_pos=data.get("examples_pos"),
+        examples_neg=data.get("examples_neg"),
+        validator=reference_validator(reference, data["message"]),
+        reference=reference,
+    )
+
+class LevelPack(Sequence):
+    """Niveles indexados por un manifiesto; cada archivo se lee al primer acceso."""
+
+    def __init__(self, manifest_path: str, cache_dir: Optional[str] = None):
+        self.root = os.path.dirname(os.path.abspath(manifest_path))
+        self.cache_dir = cache_dir
+        with open(manifest_path, encoding="utf-8") as fh:
+            self.entries: List[dict] = json.load(fh)["levels"]
+        self._loaded: List[Optional[Level]] = [None] * len(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("nivel fuera de rango")
+        level = self._loaded[i]
+        if level is None:
+            path = os.path.join(self.root, self.entries[i]["file"])
+            with instrument.timed("LevelPack.load"):
+                level = self._loaded[i] = load_level(path, self.cache_dir)
+        return level
+
+    def names(self) -> List[str]:
+        return [entry["name"] for entry in self.entries]
+
+    def find(self, name: str) -> Optional[Level]:
+        # Busca en el manifiesto para no cargar los demás niveles.
+        for i, entry in enumerate(self.entries):
+            if entry["name"] == name:
+                return self[i]
+        return None
 
 # ---------------- LISTA DE NIVELES ----------------
-LEVELS = [
-    Level(
-        name="Termina en 'a'",
-        description="Construye un AFD que acepte cadenas que terminen en 'a'.",
-        objective="El autómata debe aceptar todas las cadenas que terminen en 'a'.",
-        alphabet=["a", "b"],
-        examples_pos=["a", "ba", "bba"],
-        examples_neg=["b", "bb", "ab"],
-        validator=validate_level1
-    ),
-    Level(
-        name="Empieza con 'b'",
-        description="Construye un AFD que acepte cadenas que comiencen con 'b'.",
-        objective="El autómata debe aceptar todas las cadenas que empiecen con 'b'.",
-        alphabet=["a", "b"],
-        examples_pos=["b", "ba", "bb"],
-        examples_neg=["a", "aa", "ab"],
-        validator=validate_level2
-    ),
-    Level(
-        name="Contiene 'ab'",
-        description="Construye un AFD que acepte cadenas que contengan la subcadena 'ab'.",
-        objective="El autómata debe aceptar todas las cadenas que tengan 'ab' en cualquier posición.",
-        alphabet=["a", "b"],
-        examples_pos=["ab", "aab", "bab"],
-        examples_neg=["aa", "bb", "ba"],
-        validator=validate_level3
-    ),
-    Level(
-        name="Longitud par",
-        description="Construye un AFD que acepte cadenas de longitud par.",
-        objective="El autómata debe aceptar todas las cadenas cuya longitud sea par.",
-        alphabet=["a", "b"],
-        examples_pos=["", "aa", "bb", "abba"],
-        examples_neg=["a", "b", "aba"],
-        validator=validate_level4
-    ),
-    Level(
-        name="Número de 'a' múltiplo de 3",
-        description="Construye un AFD que acepte cadenas donde el número de 'a' sea múltiplo de 3.",
-        objective="El autómata debe aceptar todas las cadenas con cantidad de 'a' divisible entre 3.",
-        alphabet=["a", "b"],
-        examples_pos=["", "aaa", "baaab"],
-        examples_neg=["a", "aa", "aab"],
-        validator=validate_level5
-    )
-]
\ No newline at end of file
+MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels", "manifest.json")
+LEVELS = LevelPack(MANIFEST, default_cache_dir())
@@ -0,0 +1,12 @@
+import pytest
+
+from automata import analysis
+from tests.test_dfa import random_dfa
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_matrix_matches_dp(seed):
+    dfa, _ = random_dfa(3, n_states=7, seed=seed)
+    table = analysis._Table.of(dfa.compile())
+    counts = analysis._counts_dp(table, 40)
+    for n in (0, 1, 2, 7, 16, 33, 40):
+        assert analysis._count_matrix(table, n) == counts[n]
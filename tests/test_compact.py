@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+from automata.compact import CompactDFA
+from automata.dfa import State
+from engine.level_rules import Level, reference_validator, regex_reference
+from tests.test_dfa import random_dfa
+
+def words(symbols, seed, count=300):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(symbols) for _ in range(rng.randint(0, 8))) for _ in range(count)] + ["zz"]
+
+@pytest.mark.parametrize("seed", range(4))
+def test_compact_matches_dfa(seed):
+    dfa, symbols = random_dfa(3, n_states=9, seed=seed)
+    compact = CompactDFA.from_dfa(dfa)
+    assert compact.start == dfa.start
+    ws = words(symbols, seed)
+    expected = [dfa.run(w) for w in ws]
+    assert [compact.run(w) for w in ws] == expected
+    assert [compact.compile().run(w) for w in ws] == expected
+    assert [bool(x) for x in compact.run_many(ws)] == expected
+    assert compact.canonical_hash() == dfa.canonical_hash()
+    back = compact.to_dfa()
+    assert (back.states, back.start, back.accept, back.transitions) == \
+        (dfa.states, dfa.start, dfa.accept, dfa.transitions)
+
+def level():
+    return Level("Termina en 'a'", "", "", ["a", "b"], ["a"], ["b"],
+                 reference_validator(regex_reference("(a|b)*a"), "No termina en 'a'."))
+
+@pytest.mark.parametrize("start_first", [True, False])
+def test_compact_validates_like_dfa(start_first):
+    compact = CompactDFA({"a", "b"})
+    if not start_first:
+        compact.add_state("extra")
+    p, q = compact.add_state("p"), compact.add_state("q", is_accept=True)
+    compact.set_start(p)
+    assert compact.start == State("p") and compact.start_id == p
+    for frm in (p, q):
+        compact.set_transition(frm, "a", q)
+        compact.set_transition(frm, "b", p)
+    lvl = level()
+    assert lvl.validate(compact) == lvl.validate(compact.to_dfa()) == (True, [])
+    assert lvl.validate(compact, lambda: False) == (True, [])
+    compact.set_accept(q, False)
+    ok, msgs = lvl.validate(compact)
+    assert not ok and (ok, msgs) == lvl.validate(compact.to_dfa())
+
+def test_compact_without_start():
+    compact = CompactDFA({"a"})
+    compact.add_state("p")
+    assert compact.start is None and compact.start_id is None
+    assert level().validate(compact) == (False, ["Debes marcar un estado inicial."])
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from automata.dfa import DFA, Cancelled
+from automata.structure import StructureIndex
+
+def random_dfa(n_symbols, n_states=6, seed=0):
+    rng = random.Random(seed)
+    symbols = [chr(0x100 + i) for i in range(n_symbols)]
+    dfa = DFA(alphabet=set(symbols))
+    states = [dfa.add_state(f"q{i}", is_accept=rng.random() < 0.5) for i in range(n_states)]
+    dfa.set_start(states[0])
+    for s in states:
+        for sym in symbols:
+            if rng.random() < 0.9:
+                dfa.set_transition(s, sym, rng.choice(states))
+    return dfa, symbols
+
+# width = símbolos + 1: alrededor de 256 cambian los tipos de encode() y del relleno.
+@pytest.mark.parametrize("n_symbols", [254, 255, 256])
+def test_run_many_matches_run_at_byte_boundary(n_symbols):
+    dfa, symbols = random_dfa(n_symbols)
+    rng = random.Random(n_symbols)
+    words = ["".join(rng.choice(symbols) for _ in range(rng.randint(0, 9))) for _ in range(200)]
+    words.append("z" + symbols[0])
+    compiled = dfa.compile()
+    expected = [dfa.run(w) for w in words]
+    assert [bool(x) for x in compiled.run_many(words)] == expected
+    assert [compiled.run(w) for w in words] == expected
+
+def test_remove_state_drops_incident_transitions():
+    rng = random.Random(1)
+    dfa = DFA(alphabet={"a", "b"})
+    states = [dfa.add_state(f"q{i}") for i in range(30)]
+    dfa.set_start(states[0])
+    for _ in range(80):
+        dfa.set_transition(rng.choice(states), rng.choice("ab"), rng.choice(states))
+    for victim in rng.sample(states, 10):
+        expected = {k: to for k, to in dfa.transitions.items() if k[0] != victim and to != victim}
+        dfa.remove_state(victim)
+        assert dfa.transitions == expected
+        assert dfa.index.summary() == StructureIndex.build(dfa).summary()
+
+def test_long_loops_stop_when_cancelled():
+    from automata import analysis
+    dfa = DFA(alphabet={"a"})
+    states = [dfa.add_state(f"q{i}") for i in range(3000)]
+    dfa.set_start(states[0])
+    dfa.set_accept(states[-1])
+    for a, b in zip(states, states[1:]):
+        dfa.set_transition(a, "a", b)
+    other = dfa.compile()
+    dfa.set_accept(states[-2])
+    compiled = dfa.compile()
+    assert compiled.distinguish(other, lambda: False) == "a" * 2998
+    with pytest.raises(Cancelled):
+        compiled.distinguish(other, lambda: True)
+    with pytest.raises(Cancelled):
+        compiled.minimize(lambda: True)
+    with pytest.raises(Cancelled):
+        analysis.compare(compiled, other, 8, lambda: True)
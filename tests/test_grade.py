@@ -0,0 +1,18 @@
+import json
+
+import pytest
+
+from engine.grade import grade_chunk
+
+GOOD = {"id": "ok", "level": 1, "dfa": {
+    "alphabet": ["a", "b"], "states": ["p", "q"], "start": "p", "accept": ["q"],
+    "transitions": [["p", "a", "q"], ["p", "b", "p"], ["q", "a", "q"], ["q", "b", "p"]]}}
+
+@pytest.mark.parametrize("line", ["[1, 2]", "3", '"texto"', "null", "{roto",
+                                  '{"id": 1, "level": 1, "dfa": [1]}',
+                                  '{"id": 1, "level": 1, "dfa": {"states": 5}}'])
+def test_bad_line_becomes_error_row(line):
+    results = grade_chunk([line, json.dumps(GOOD)])
+    assert len(results) == 2
+    assert results[0]["ok"] is False and "error" in results[0]
+    assert results[1]["ok"] is True and results[1]["id"] == "ok"
@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+from automata.dfa import DFA
+from benchmarks.run import headless_app
+from ui.history import History, apply_op
+from ui.spatial import SpatialGrid
+
+def editor():
+    dfa = DFA(alphabet={"a", "b"})
+    positions = {}
+    spatial = SpatialGrid()
+    history = History(lambda op: apply_op(dfa, positions, spatial, op), limit=3)
+    return dfa, positions, history
+
+def snapshot(dfa, positions):
+    return set(dfa.states), dfa.start, set(dfa.accept), dict(dfa.transitions), dict(positions)
+
+def test_undo_redo_in_order():
+    dfa, positions, history = editor()
+    steps = [snapshot(dfa, positions)]
+    p = dfa.add_state("p")
+    dfa.remove_state(p)
+    history.do([("state", p, (0, 0))], [("state", p, None)])
+    steps.append(snapshot(dfa, positions))
+    history.do([("start", p)], [("start", None)])
+    steps.append(snapshot(dfa, positions))
+    history.do([("edge", p, "a", p), ("accept", p, True)], [("accept", p, False), ("edge", p, "a", None)])
+    steps.append(snapshot(dfa, positions))
+    for expected in reversed(steps[:-1]):
+        assert history.undo()
+        assert snapshot(dfa, positions) == expected
+    assert not history.undo() and history.can_redo
+    for expected in steps[1:]:
+        assert history.redo()
+        assert snapshot(dfa, positions) == expected
+    assert not history.redo()
+
+def test_new_edit_clears_redo_and_limit_drops_oldest():
+    dfa, positions, history = editor()
+    states = [dfa.add_state(f"q{i}") for i in range(5)]
+    for s in states:
+        history.do([("move", s, (1, 1))], [("move", s, (0, 0))])
+    assert len(history.done) == 3
+    assert history.undo() and history.can_redo
+    history.do([("accept", states[0], True)], [("accept", states[0], False)])
+    assert not history.can_redo
+    while history.undo():
+        pass
+    # Las dos ediciones más antiguas ya no se pueden deshacer.
+    assert positions == {states[0]: (1, 1), states[1]: (1, 1), states[2]: (0, 0), states[3]: (0, 0),
+                         states[4]: (0, 0)}
+
+def test_empty_edit_is_not_recorded():
+    dfa, positions, history = editor()
+    s = dfa.add_state("p")
+    history.do([("move", s, (1, 1))], [("move", s, (0, 0))])
+    history.undo()
+    history.do([], [])
+    assert not history.can_undo and history.can_redo
+
+def headless(n=3):
+    dfa = DFA(alphabet={"a"})
+    states = [dfa.add_state(f"q{i}") for i in range(n)]
+    dfa.set_start(states[0])
+    for a, b in zip(states, states[1:]):
+        dfa.set_transition(a, "a", b)
+    app = headless_app(dfa, {s: (100.0 * i, 100.0) for i, s in enumerate(states)})
+    app.after_idle = lambda func, *args: func(*args)
+    return app, states
+
+def test_drag_is_one_entry():
+    app, states = headless()
+    x, y = app.to_screen(*app.state_positions[states[1]])
+    app.start_drag(SimpleNamespace(x=x, y=y))
+    for step in range(1, 20):
+        app.do_drag(SimpleNamespace(x=x + step, y=y + 2 * step))
+    app.stop_drag(SimpleNamespace(x=x + 19, y=y + 38))
+    moved = app.state_positions[states[1]]
+    assert len(app.history.done) == 1
+    app.history.undo()
+    assert app.state_positions[states[1]] == (100.0, 100.0)
+    app.history.redo()
+    assert app.state_positions[states[1]] == moved
+
+def test_auto_layout_twice_records_once():
+    app, _ = headless()
+    app.auto_layout()
+    assert len(app.history.done) == 1
+    app.history.undo()
+    app.history.redo()
+    app.auto_layout()
+    assert len(app.history.done) == 1 and not app.history.can_redo
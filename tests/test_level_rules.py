@@ -0,0 +1,23 @@
+from automata import instrument
+from automata.dfa import DFA
+from engine.level_rules import Level, reference_validator, regex_reference
+
+def test_reference_runs_stay_out_of_transition_hits():
+    dfa = DFA(alphabet={"a", "b"})
+    p = dfa.add_state("p", is_start=True)
+    q = dfa.add_state("q", is_accept=True)
+    dfa.set_transition(p, "b", q)
+    dfa.set_transition(q, "a", p)
+    level = Level("Mapa de calor", "", "", ["a", "b"], ["a"], ["b"],
+                  reference_validator(regex_reference("(a|b)*a"), "No termina en 'a'."))
+    instrument.enable()
+    instrument.reset()
+    try:
+        assert dfa.run("ba") is False
+        ok, msgs = level.validate(dfa)
+        hits = dict(instrument.transition_hits)
+    finally:
+        instrument.disable()
+        instrument.reset()
+    assert not ok and "Contraejemplo" in msgs[1]
+    assert hits == {(p, "b"): 1, (q, "a"): 1}
@@ -0,0 +1,43 @@
+import itertools
+import re
+
+import pytest
+
+from automata.nfa import compile_regex
+
+PATTERNS = ["a", "(a|b)*a", "a*b+c?", "(ab|ba)*", "[ab]c*", "[a-c]+b", "(a|)b", "a.c", "\\.a*",
+            "((a|b)(b|c))*|c+", "(a*)*b", "a?a?a?aaa"]
+
+def words(symbols, max_len=6):
+    for n in range(max_len + 1):
+        for w in itertools.product(symbols, repeat=n):
+            yield "".join(w)
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_regex_matches_python_re(pattern):
+    alphabet = "abc."
+    nfa = compile_regex(pattern, alphabet)
+    lazy = nfa.lazy()
+    compiled = nfa.determinize().compile()
+    expected_re = re.compile(pattern.replace(".", "[abc.]") if pattern != "\\.a*" else pattern)
+    for w in words(alphabet, 5):
+        expected = expected_re.fullmatch(w) is not None
+        assert nfa.run(w) == lazy.run(w) == compiled.run(w) == expected, (pattern, w)
+
+@pytest.mark.parametrize("pattern", ["(a", "a)", "*a", "a|*", "[]", "[ab", "a\\", "[a\\", "c", "[bc]", "."])
+def test_parse_errors(pattern):
+    with pytest.raises(ValueError):
+        compile_regex(pattern, "ab" if pattern != "." else None)
+
+def test_lazy_dfa_evicts_and_rebuilds():
+    nfa = compile_regex("(a|b)*a(a|b)(a|b)(a|b)", "ab")
+    lazy = nfa.lazy(cache_size=3)
+    for w in words("ab", 8):
+        assert lazy.run(w) == (len(w) >= 4 and w[-4] == "a")
+        assert len(lazy.cache) <= 3
+    stats = lazy.stats()
+    assert stats["cached"] == 3 and stats["capacity"] == 3
+    assert stats["evictions"] > 0 and stats["evictions"] == stats["misses"] - 3
+    assert stats["hits"] > 0
+    with pytest.raises(ValueError):
+        nfa.lazy(cache_size=0)
@@ -0,0 +1,32 @@
+import random
+
+from automata.dfa import DFA
+from benchmarks.run import headless_app
+from ui.spatial import SegmentGrid, segment_in_rect
+
+def test_segment_cells_cover_sampled_points():
+    rng = random.Random(0)
+    grid = SegmentGrid(50)
+    for _ in range(500):
+        x1, y1, x2, y2 = (rng.uniform(-500, 500) for _ in range(4))
+        if rng.random() < 0.2:
+            x2 = x1
+        cells = set(grid._cells_on(x1, y1, x2, y2))
+        for i in range(501):
+            t = i / 500
+            assert (int((x1 + t * (x2 - x1)) // 50), int((y1 + t * (y2 - y1)) // 50)) in cells
+
+def test_segment_in_rect():
+    assert segment_in_rect(-10, 5, 20, 5, 0, 0, 10, 10)
+    assert not segment_in_rect(-10, 20, 20, 20, 0, 0, 10, 10)
+    assert not segment_in_rect(-10, 0, 0, 30, 0, 0, 10, 10)
+
+def test_redraw_keeps_edges_crossing_the_view():
+    dfa = DFA(alphabet={"a", "b"})
+    p = dfa.add_state("p", is_start=True)
+    q = dfa.add_state("q")
+    dfa.set_transition(p, "a", q)
+    app = headless_app(dfa, {p: (-2000, 300), q: (3000, 300)})
+    app.redraw()
+    assert list(app.edge_items) == [(p, "a")]
+    assert not app.state_items
@@ -0,0 +1,58 @@
+import pytest
+
+from automata import storage
+from automata.dfa import DFA
+from engine import level_rules
+
+def sample_dfa():
+    dfa = DFA(alphabet={"a", "b"})
+    p = dfa.add_state("p", is_start=True)
+    q = dfa.add_state("q", is_accept=True)
+    dfa.set_transition(p, "a", q)
+    dfa.set_transition(q, "b", p)
+    return dfa
+
+@pytest.mark.parametrize("positions", [False, True])
+def test_load_binary_rejects_truncated_files(tmp_path, positions):
+    dfa = sample_dfa()
+    path = tmp_path / "x.afdb"
+    storage.save_binary(path, dfa, {s: (1.0, 2.0) for s in dfa.states} if positions else None)
+    data = path.read_bytes()
+    compiled, _ = storage.load_binary(path)
+    assert compiled.distinguish(dfa.compile()) is None
+    for size in range(1, len(data)):
+        path.write_bytes(data[:size])
+        with pytest.raises(ValueError):
+            storage.load_binary(path)
+    path.write_bytes(data + b"\0")
+    with pytest.raises(ValueError):
+        storage.load_binary(path)
+
+def test_damaged_reference_cache_is_rebuilt(tmp_path):
+    cache = tmp_path / "cache"
+    build = level_rules.regex_reference("(a|b)*a")
+    level_rules.cached_reference(build, "k", str(cache))()
+    good = (cache / "k.afdb").read_bytes()
+    _, _, _, n, k, _, blob_size, _ = storage._HEADER.unpack_from(good)
+    # Mismo tamaño, otro contenido: aceptación invertida y una celda fuera de rango.
+    flipped = bytearray(good)
+    for i in range(len(good) - blob_size - n - 1, len(good) - blob_size - 1):
+        flipped[i] ^= 1
+    cell = bytearray(good)
+    cell[storage._HEADER_SIZE + 4 * k] = 0x7F
+    for damaged in (good[:10], good[:-3], bytes(flipped), bytes(cell)):
+        (cache / "k.afdb").write_bytes(damaged)
+        ref = level_rules.cached_reference(build, "k", str(cache))()
+        assert ref.run("ba") and not ref.run("ab")
+        assert (cache / "k.afdb").read_bytes() == good
+
+def test_load_binary_reads_version_1(tmp_path):
+    dfa = sample_dfa()
+    path = tmp_path / "x.afdb"
+    storage.save_binary(path, dfa)
+    data = bytearray(path.read_bytes())
+    storage._HEADER.pack_into(data, 0, *storage._HEADER.unpack_from(data)[:1], 1,
+                              *storage._HEADER.unpack_from(data)[2:7], 0)
+    path.write_bytes(bytes(data))
+    compiled, _ = storage.load_binary(path)
+    assert compiled.distinguish(dfa.compile()) is None
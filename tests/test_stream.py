@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from automata.dfa import DFA
+from automata.stream import BLOCK, StreamRunner
+
+def ends_in_a():
+    dfa = DFA(alphabet={"a", "b"})
+    p = dfa.add_state("p", is_start=True)
+    q = dfa.add_state("q", is_accept=True)
+    for s in (p, q):
+        dfa.set_transition(s, "a", q)
+        dfa.set_transition(s, "b", p)
+    return dfa
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_feed_file_resumes_from_checkpoint(tmp_path, use_mmap):
+    compiled = ends_in_a().compile()
+    rng = random.Random(use_mmap)
+    path = tmp_path / "log"
+    path.write_bytes(b"")
+    content = b""
+    checkpoint = StreamRunner(compiled).checkpoint()
+    for _ in range(6):
+        # El archivo crece entre lecturas; cada una reanuda desde el checkpoint.
+        extra = bytes(rng.choice(b"ab") for _ in range(rng.randint(0, 5000)))
+        content += extra
+        with open(path, "ab") as fh:
+            fh.write(extra)
+        runner = StreamRunner.resume(compiled, checkpoint)
+        assert runner.feed_file(path, chunk_size=333, use_mmap=use_mmap)
+        checkpoint = runner.checkpoint()
+        assert checkpoint["consumed"] == len(content)
+        assert runner.result() == compiled.run(content.decode("latin-1"))
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_feed_file_stops_at_dead_state(tmp_path, use_mmap):
+    compiled = ends_in_a().compile()
+    path = tmp_path / "log"
+    path.write_bytes(b"ab" * 100 + b"c" + b"a" * 100)
+    runner = compiled.stream()
+    assert not runner.feed_file(path, chunk_size=64, use_mmap=use_mmap)
+    assert runner.dead and not runner.result()
+
+def test_str_feeds_count_chars_and_cannot_resume_a_file(tmp_path):
+    compiled = ends_in_a().compile()
+    runner = compiled.stream()
+    assert runner.feed("ab")
+    # Se detiene en el primer bloque que cae al sumidero.
+    assert not runner.feed("añ" + "a" * 3 * BLOCK)
+    assert runner.dead and runner.consumed == 2 + BLOCK
+    resumed = StreamRunner.resume(compiled, runner.checkpoint())
+    assert resumed.unit == "chars"
+    path = tmp_path / "log"
+    path.write_bytes(b"aaaa")
+    with pytest.raises(ValueError):
+        resumed.feed_file(path)
+    with pytest.raises(ValueError):
+        runner.feed(b"a")
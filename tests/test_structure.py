@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from automata.dfa import DFA
+from automata.structure import StructureIndex
+
+def view(index):
+    # Lo observable del índice; las multiplicidades en cero no cuentan.
+    succ = {s: {t: c for t, c in out.items() if c} for s, out in index.succ.items()}
+    pred = {s: {t: c for t, c in inc.items() if c} for s, inc in index.pred.items()}
+    return (index.by_name, succ, pred, {s: d for s, d in index.out_degree.items() if d}, index.start,
+            index.accept, index.reachable, index.coreachable, index.missing)
+
+@pytest.mark.parametrize("seed", range(8))
+def test_incremental_index_matches_rebuild(seed):
+    rng = random.Random(seed)
+    dfa = DFA(alphabet={"a", "b", "c"})
+    names = [f"q{i}" for i in range(12)]
+    for name in names[:4]:
+        dfa.add_state(name)
+    dfa.set_start(dfa.state_named("q0"))
+    for step in range(400):
+        states = sorted(dfa.states, key=lambda s: s.name)
+        op = rng.random()
+        if not states or op < 0.1:
+            dfa.add_state(rng.choice(names))
+        elif op < 0.45:
+            dfa.set_transition(rng.choice(states), rng.choice("abc"), rng.choice(states))
+        elif op < 0.65:
+            if dfa.transitions:
+                dfa.remove_transition(*rng.choice(sorted(dfa.transitions, key=lambda k: (k[0].name, k[1]))))
+        elif op < 0.8:
+            dfa.set_accept(rng.choice(states), rng.random() < 0.5)
+        elif op < 0.9:
+            dfa.set_start(rng.choice(states))
+        else:
+            dfa.remove_state(rng.choice(states))
+        assert view(dfa.index) == view(StructureIndex.build(dfa)), step
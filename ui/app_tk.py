@@ -1,27 +1,65 @@
 import tkinter as tk
-from tkinter import messagebox, simpledialog
+from tkinter import filedialog, messagebox, simpledialog
 from automata.dfa import DFA, State
+from automata import instrument, storage
+from ui.history import History, apply_op
+from ui.layout import layered_layout
+from ui.spatial import SegmentGrid, SpatialGrid, segment_in_rect
+from ui.simulation import TracePlayer, compute_trace, final_state
+from ui.validation import ValidationWorker
 from engine.level_rules import LEVELS
 
+SIM_JUMP_LENGTH = 200  # cadenas más largas se simulan directo al resultado
+AUTO_VALIDATE_MS = 600  # espera tras la última edición antes de revalidar
+STATE_RADIUS = 25
+ZOOM_MIN, ZOOM_MAX = 0.05, 4.0
+LABEL_MIN_SCALE = 0.6  # con menos zoom no se dibujan nombres ni símbolos
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Juego de Autómatas")
         self.state('zoomed')  # ventana maximizada
+        self.init_editor_state()
+        self.show_menu()
+
+    def init_editor_state(self):
+        # Atributos del editor; separado de __init__ para poder usarlo sin ventana.
         self.alphabet = {"a", "b"}
         self.dfa = None
         self.level_idx = 0
         self.state_positions = {}
+        self.spatial = SpatialGrid()  # centros de estados para el hit-test
+        self.edge_grid = SegmentGrid()  # aristas, para dibujar las que cruzan la vista
         self.is_tutorial = False
         self.tutorial_step = 0
         self.state_counter = 0  # nombres automáticos q0, q1...
         self.dragging_state = None
         self.drag_offset_x = 0
         self.drag_offset_y = 0
-        self.show_menu()
+        self.drag_edges = []
+        self.drag_origin = None
+        self._drag_job = None
+        self.history = History(self.apply_edit)
+        self.validator = ValidationWorker(self)
+        self._validate_job = None
+        self.state_items = {}  # State -> (óvalo, anillo de aceptación o None, etiqueta)
+        self.edge_items = {}   # (State, símbolo) -> (línea, etiqueta)
+        self.player = None
+        self.heatmap_on = False
+        # Vista: las posiciones son coordenadas del mundo; pantalla = (mundo - origen) * escala.
+        self.view_scale = 1.0
+        self.view_x = 0.0
+        self.view_y = 0.0
+        self._pan = None
+        self._view_job = None
 
     # ---------------- MENÚ INICIAL ----------------
     def show_menu(self):
+        self.stop_simulation()
+        self.cancel_validation()
+        for seq in ("<Control-z>", "<Control-y>", "<Control-Z>"):
+            self.unbind(seq)
         for widget in self.winfo_children():
             widget.destroy()
 
@@ -62,6 +100,10 @@ class App(tk.Tk):
         self.level_idx = 0
         self.dfa = DFA(alphabet=self.alphabet)
         self.state_positions = {}
+        self.spatial.clear()
+        self.edge_grid.clear()
+        self.history.clear()
+        self.reset_view()
         self.state_counter = 0
         self.show_game_ui()
 
@@ -70,11 +112,17 @@ class App(tk.Tk):
         self.tutorial_step = 0
         self.dfa = DFA(alphabet=self.alphabet)
         self.state_positions = {}
+        self.spatial.clear()
+        self.edge_grid.clear()
+        self.history.clear()
+        self.reset_view()
         self.state_counter = 0
         self.show_game_ui()
         messagebox.showinfo("Tutorial", "Bienvenido al tutorial.\nVamos a construir tu primer autómata paso a paso.", parent=self)
 
     def show_game_ui(self):
+        self.stop_simulation()
+        self.cancel_validation()
         for widget in self.winfo_children():
             widget.destroy()
 
@@ -86,6 +134,15 @@ class App(tk.Tk):
         self.canvas.bind("<ButtonPress-1>", self.start_drag)
         self.canvas.bind("<B1-Motion>", self.do_drag)
         self.canvas.bind("<ButtonRelease-1>", self.stop_drag)
+        self.canvas.bind("<MouseWheel>", self.zoom)
+        self.canvas.bind("<Button-4>", self.zoom)
+        self.canvas.bind("<Button-5>", self.zoom)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_view_redraw())
+        self.bind("<Control-z>", self.undo)
+        self.bind("<Control-y>", self.redo)
+        self.bind("<Control-Z>", self.redo)
+        self.state_items = {}
+        self.edge_items = {}
 
         # Panel lateral fijo y oscuro
         sidebar = tk.Frame(self, bg="#2c2c3c", width=300)
@@ -104,8 +161,26 @@ class App(tk.Tk):
                   command=self.add_transition, **btn_style).pack(pady=6)
         tk.Button(sidebar, text=" Borrar transición", bg="#e91e63",
                   command=self.delete_transition, **btn_style).pack(pady=6)
+        edit_controls = tk.Frame(sidebar, bg="#2c2c3c")
+        edit_controls.pack(pady=2)
+        tk.Button(edit_controls, text="↶ Deshacer", command=self.undo, font=("Arial", 11, "bold"),
+                  fg="white", bg="#455a64", width=10).pack(side=tk.LEFT, padx=2)
+        tk.Button(edit_controls, text="↷ Rehacer", command=self.redo, font=("Arial", 11, "bold"),
+                  fg="white", bg="#455a64", width=10).pack(side=tk.LEFT, padx=2)
+        view_controls = tk.Frame(sidebar, bg="#2c2c3c")
+        view_controls.pack(pady=2)
+        tk.Button(view_controls, text="⊞ Ordenar", command=self.auto_layout, font=("Arial", 11, "bold"),
+                  fg="white", bg="#455a64", width=10).pack(side=tk.LEFT, padx=2)
+        tk.Button(view_controls, text="⤢ Ajustar", command=self.fit_view, font=("Arial", 11, "bold"),
+                  fg="white", bg="#455a64", width=10).pack(side=tk.LEFT, padx=2)
         tk.Button(sidebar, text=" Probar nivel", bg="#673ab7",
                   command=self.test_level, **btn_style).pack(pady=10)
+        tk.Button(sidebar, text=" Guardar", bg="#009688",
+                  command=self.save_file, **btn_style).pack(pady=4)
+        tk.Button(sidebar, text=" Abrir", bg="#795548",
+                  command=self.load_file, **btn_style).pack(pady=4)
+        tk.Button(sidebar, text=" Mapa de calor", bg="#bf360c",
+                  command=self.toggle_heatmap, **btn_style).pack(pady=4)
         tk.Button(sidebar, text=" Volver al menú", bg="#f44336",
                   command=self.show_menu, **btn_style).pack(pady=10)
 
@@ -116,6 +191,19 @@ class App(tk.Tk):
                   command=lambda: self.simulate(self.entry.get()),
                   font=("Arial", 14, "bold"), width=20, height=2).pack(pady=4)
 
+        # Controles de la simulación
+        sim_controls = tk.Frame(sidebar, bg="#2c2c3c")
+        sim_controls.pack(pady=2)
+        small_btn = {"font": ("Arial", 11, "bold"), "fg": "white", "bg": "#455a64", "width": 7}
+        tk.Button(sim_controls, text="⏯ Pausa", command=self.toggle_simulation, **small_btn).pack(side=tk.LEFT, padx=2)
+        tk.Button(sim_controls, text="⏭ Paso", command=self.step_simulation, **small_btn).pack(side=tk.LEFT, padx=2)
+        tk.Button(sim_controls, text="⏩ Final", command=self.jump_simulation, **small_btn).pack(side=tk.LEFT, padx=2)
+        self.sim_speed = tk.Scale(sidebar, from_=50, to=1000, resolution=50, orient=tk.HORIZONTAL,
+                                  label="Pausa entre pasos (ms)", bg="#2c2c3c", fg="white",
+                                  highlightthickness=0, command=self.set_simulation_speed)
+        self.sim_speed.set(350)
+        self.sim_speed.pack(fill="x", padx=10)
+
         # Objetivo destacado
         self.objective_label = tk.Label(sidebar, text="", justify="left", wraplength=260,
                                         bg="#2c2c3c", fg="#ffeb3b", font=("Arial", 12, "bold"))
@@ -133,6 +221,17 @@ class App(tk.Tk):
         self.tutorial_label.pack(fill="x", pady=6)
         self.update_tutorial_text()
 
+        # Diagnóstico en vivo del autómata
+        self.diagnostics_label = tk.Label(sidebar, text="", justify="left", wraplength=260,
+                                          bg="#2c2c3c", fg="#b0bec5", font=("Arial", 11))
+        self.diagnostics_label.pack(fill="x", pady=6)
+        self.update_diagnostics()
+
+        # Resultado de la validación en segundo plano
+        self.validation_label = tk.Label(sidebar, text="", justify="left", wraplength=260,
+                                         bg="#2c2c3c", fg="#b0bec5", font=("Arial", 11))
+        self.validation_label.pack(fill="x", pady=6)
+
     # ---------------- LÓGICA DE JUEGO ----------------
     def update_level_text(self):
         lvl = LEVELS[self.level_idx]
@@ -157,12 +256,21 @@ class App(tk.Tk):
         else:
             self.tutorial_label.config(text="")
 
+    def update_diagnostics(self):
+        info = self.dfa.index.summary()
+        self.diagnostics_label.config(text=(
+            f" Estados: {info['states']}\n"
+            f" Inalcanzables: {info['unreachable']}\n"
+            f" Sin camino a aceptación: {info['dead']}\n"
+            f" Transiciones faltantes: {info['missing']}"))
+
     def add_state_click(self, event):
         name = f"q{self.state_counter}"
         self.state_counter += 1
-        s = self.dfa.add_state(name)
-        self.state_positions[s] = (event.x, event.y)
+        s = State(name)
+        self.history.do([("state", s, self.to_world(event.x, event.y))], [("state", s, None)])
         self.draw_state(s, highlight=True)
+        self.update_diagnostics()
         self.after(300, self.redraw)  # vuelve al color normal después de 300ms
         if self.is_tutorial and self.tutorial_step == 0 and name == "q0":
             self.tutorial_step += 1
@@ -170,14 +278,61 @@ class App(tk.Tk):
             self.update_tutorial_text()
 
     def draw_state(self, state: State, highlight=False):
-        x, y = self.state_positions[state]
-        r = 25
+        for item in self.state_items.pop(state, ()):
+            if item is not None:
+                self.canvas.delete(item)
+        x, y = self.to_screen(*self.state_positions[state])
+        r = STATE_RADIUS * self.view_scale
+        ring_r = r + 5 * self.view_scale
         outline = "green" if state == self.dfa.start else "black"
         fill_color = "yellow" if highlight else "white"
-        self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=fill_color, outline=outline, width=2)
+        oval = self.canvas.create_oval(x - r, y - r, x + r, y + r, fill=fill_color, outline=outline,
+                                       width=2, tags=("state",))
+        ring = None
         if state in self.dfa.accept:
-            self.canvas.create_oval(x - r - 5, y - r - 5, x + r + 5, y + r + 5, outline="blue", width=2)
-        self.canvas.create_text(x, y, text=state.name)
+            ring = self.canvas.create_oval(x - ring_r, y - ring_r, x + ring_r, y + ring_r, outline="blue",
+                                           width=2, tags=("state",))
+        label = None
+        if self.view_scale >= LABEL_MIN_SCALE:
+            label = self.canvas.create_text(x, y, text=state.name, tags=("state",))
+        self.state_items[state] = (oval, ring, label)
+
+    def draw_transition(self, frm: State, sym: str, to: State):
+        for item in self.edge_items.pop((frm, sym), ()):
+            if item is not None:
+                self.canvas.delete(item)
+        x1, y1 = self.to_screen(*self.state_positions[frm])
+        x2, y2 = self.to_screen(*self.state_positions[to])
+        line = self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST, tags=("edge",))
+        label = None
+        if self.view_scale >= LABEL_MIN_SCALE:
+            label = self.canvas.create_text((x1 + x2) // 2, (y1 + y2) // 2 - 10, text=sym, tags=("edge",))
+        self.edge_items[(frm, sym)] = (line, label)
+
+    def move_state_items(self, state: State):
+        # Mueve en su sitio los elementos del estado y de sus aristas incidentes.
+        items = self.state_items.get(state)
+        if not items:
+            return
+        oval, ring, label = items
+        x, y = self.to_screen(*self.state_positions[state])
+        r = STATE_RADIUS * self.view_scale
+        ring_r = r + 5 * self.view_scale
+        self.canvas.coords(oval, x - r, y - r, x + r, y + r)
+        if ring is not None:
+            self.canvas.coords(ring, x - ring_r, y - ring_r, x + ring_r, y + ring_r)
+        if label is not None:
+            self.canvas.coords(label, x, y)
+        for frm, sym in self.drag_edges:
+            to = self.dfa.transitions.get((frm, sym))
+            edge = self.edge_items.get((frm, sym))
+            if to is None or edge is None:
+                continue
+            x1, y1 = self.to_screen(*self.state_positions[frm])
+            x2, y2 = self.to_screen(*self.state_positions[to])
+            self.canvas.coords(edge[0], x1, y1, x2, y2)
+            if edge[1] is not None:
+                self.canvas.coords(edge[1], (x1 + x2) // 2, (y1 + y2) // 2 - 10)
 
     def mark_start(self):
         if not self.dfa.states:
@@ -186,10 +341,10 @@ class App(tk.Tk):
         name = simpledialog.askstring("Inicial", f"Selecciona estado ({', '.join(names)}):", parent=self)
         if not name:
             return
-        st = next((s for s in self.dfa.states if s.name == name), None)
+        st = self.dfa.state_named(name)
         if not st:
             return
-        self.dfa.start = st
+        self.history.do([("start", st)], [("start", self.dfa.start)])
         messagebox.showinfo("Listo", f"Estado inicial: {st.name}", parent=self)
         self.redraw()
         if self.is_tutorial and self.tutorial_step == 1 and name == "q0":
@@ -204,13 +359,11 @@ class App(tk.Tk):
         name = simpledialog.askstring("Aceptar", f"Selecciona estado ({', '.join(names)}):", parent=self)
         if not name:
             return
-        st = next((s for s in self.dfa.states if s.name == name), None)
+        st = self.dfa.state_named(name)
         if not st:
             return
-        if st in self.dfa.accept:
-            self.dfa.accept.remove(st)
-        else:
-            self.dfa.accept.add(st)
+        accepting = st not in self.dfa.accept
+        self.history.do([("accept", st, accepting)], [("accept", st, not accepting)])
         self.redraw()
         if self.is_tutorial and self.tutorial_step == 2 and name == "q1":
             self.tutorial_step += 1
@@ -226,62 +379,251 @@ class App(tk.Tk):
         symbol = simpledialog.askstring("Símbolo", f"Símbolo ({', '.join(self.alphabet)}):", parent=self)
         if not from_name or not to_name or not symbol:
             return
-        st_from = next((s for s in self.dfa.states if s.name == from_name), None)
-        st_to = next((s for s in self.dfa.states if s.name == to_name), None)
+        st_from = self.dfa.state_named(from_name)
+        st_to = self.dfa.state_named(to_name)
         if not st_from or not st_to:
             return
-        self.dfa.set_transition(st_from, symbol, st_to)
-        x1, y1 = self.state_positions[st_from]
-        x2, y2 = self.state_positions[st_to]
-        self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST)
-        self.canvas.create_text((x1 + x2) // 2, (y1 + y2) // 2 - 10, text=symbol)
+        old = self.dfa.transitions.get((st_from, symbol))
+        self.history.do([("edge", st_from, symbol, st_to)], [("edge", st_from, symbol, old)])
+        self.draw_transition(st_from, symbol, st_to)
+        self.update_diagnostics()
         if self.is_tutorial and self.tutorial_step == 3 and from_name == "q0" and to_name == "q1" and symbol == "a":
             self.tutorial_step += 1
             messagebox.showinfo("Tutorial", "Perfecto. Ahora haz clic en 'Probar nivel'.", parent=self)
             self.update_tutorial_text()
 
     def redraw(self):
+        # Solo se dibuja lo que cae dentro de la vista (más un margen).
+        t0 = instrument.clock() if instrument.ENABLED else 0.0
         self.canvas.delete("all")
-        for st in self.dfa.states:
+        self.state_items = {}
+        self.edge_items = {}
+        rect = self.visible_rect()
+        visible = self.spatial.in_rect(*rect)
+        for st in visible:
             self.draw_state(st)
-        for (frm, sym), to in self.dfa.transitions.items():
-            x1, y1 = self.state_positions[frm]
-            x2, y2 = self.state_positions[to]
-            self.canvas.create_line(x1, y1, x2, y2, arrow=tk.LAST)
-            self.canvas.create_text((x1 + x2) // 2, (y1 + y2) // 2 - 10, text=sym)
+        if len(visible) == len(self.dfa.states):
+            edges = self.dfa.transitions
+        else:
+            edges = self.incident_edges(visible)
+            # También las aristas que cruzan la vista con ambos extremos fuera.
+            transitions = self.dfa.transitions
+            positions = self.state_positions
+            for key in self.edge_grid.in_rect(*rect):
+                to = transitions.get(key)
+                if to is not None and key not in edges and \
+                        segment_in_rect(*positions[key[0]], *positions[to], *rect):
+                    edges[key] = to
+        for (frm, sym), to in edges.items():
+            self.draw_transition(frm, sym, to)
+        if self.heatmap_on:
+            self.apply_heatmap()
+        self.update_diagnostics()
+        if instrument.ENABLED:
+            items = sum(item is not None for items in self.state_items.values() for item in items)
+            items += sum(item is not None for items in self.edge_items.values() for item in items)
+            instrument.record("App.redraw", instrument.clock() - t0, items=items)
+
+    def incident_edges(self, states):
+        # Aristas que salen de o llegan a ``states``, sin recorrer todas las transiciones.
+        transitions = self.dfa.transitions
+        symbols = self.dfa.alphabet
+        pred = self.dfa.index.pred
+        edges = {}
+        for st in states:
+            for sym in symbols:
+                to = transitions.get((st, sym))
+                if to is not None:
+                    edges[(st, sym)] = to
+            for frm in pred.get(st, ()):
+                for sym in symbols:
+                    if transitions.get((frm, sym)) == st:
+                        edges[(frm, sym)] = st
+        return edges
+
+    def index_edges(self, keys):
+        # Actualiza la rejilla de aristas para ``keys`` (las que ya no existen se quitan).
+        transitions = self.dfa.transitions
+        positions = self.state_positions
+        for key in keys:
+            to = transitions.get(key)
+            if to is None:
+                self.edge_grid.remove(key)
+            else:
+                self.edge_grid.insert(key, *positions[key[0]], *positions[to])
+
+    def reindex(self):
+        # Tras reemplazar dfa/state_positions de golpe.
+        self.spatial.rebuild(self.state_positions)
+        self.edge_grid.clear()
+        self.index_edges(self.dfa.transitions)
+
+    # ---------------- VISTA: ZOOM Y DESPLAZAMIENTO ----------------
+    def to_screen(self, x, y):
+        return (x - self.view_x) * self.view_scale, (y - self.view_y) * self.view_scale
+
+    def to_world(self, x, y):
+        return x / self.view_scale + self.view_x, y / self.view_scale + self.view_y
+
+    def visible_rect(self):
+        margin = 2 * STATE_RADIUS
+        x1, y1 = self.to_world(0, 0)
+        x2, y2 = self.to_world(self.canvas.winfo_width(), self.canvas.winfo_height())
+        return x1 - margin, y1 - margin, x2 + margin, y2 + margin
+
+    def reset_view(self):
+        self.view_scale = 1.0
+        self.view_x = self.view_y = 0.0
+
+    def schedule_view_redraw(self):
+        # Varios eventos de zoom o desplazamiento se agrupan en un solo redibujo.
+        if self._view_job is None:
+            self._view_job = self.after_idle(self._flush_view)
+
+    def _flush_view(self):
+        self._view_job = None
+        if self.dfa is not None:
+            self.redraw()
+
+    def zoom(self, event):
+        factor = 1.2 if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0 else 1 / 1.2
+        scale = min(max(self.view_scale * factor, ZOOM_MIN), ZOOM_MAX)
+        # El punto bajo el cursor queda fijo.
+        wx, wy = self.to_world(event.x, event.y)
+        self.view_scale = scale
+        self.view_x = wx - event.x / scale
+        self.view_y = wy - event.y / scale
+        self.schedule_view_redraw()
+
+    def fit_view(self):
+        if not self.state_positions:
+            self.reset_view()
+            self.redraw()
+            return
+        xs = [x for x, _ in self.state_positions.values()]
+        ys = [y for _, y in self.state_positions.values()]
+        margin = 2 * STATE_RADIUS
+        width = max(xs) - min(xs) + 2 * margin
+        height = max(ys) - min(ys) + 2 * margin
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self.view_scale = min(max(min(w / width, h / height), ZOOM_MIN), 1.0)
+        self.view_x = (min(xs) + max(xs)) / 2 - w / (2 * self.view_scale)
+        self.view_y = (min(ys) + max(ys)) / 2 - h / (2 * self.view_scale)
+        self.redraw()
+
+    def auto_layout(self):
+        if not self.dfa or not self.dfa.states:
+            return
+        new = layered_layout(self.dfa)
+        old = self.state_positions
+        moved = [st for st, pos in new.items() if old.get(st) != pos]
+        if moved:
+            # Todo el acomodo es una sola entrada del historial.
+            self.history.do([("move", st, new[st]) for st in moved], [("move", st, old[st]) for st in moved])
+        self.fit_view()
+
+    def toggle_heatmap(self):
+        if not instrument.ENABLED:
+            messagebox.showinfo("Mapa de calor",
+                                "Activa la instrumentación (AUTOMATA_PROFILE=1) para contar transiciones.",
+                                parent=self)
+            return
+        self.heatmap_on = not self.heatmap_on
+        self.redraw()
+
+    def apply_heatmap(self):
+        # Colorea cada arista según cuántas veces se ha recorrido.
+        hits = {key: instrument.transition_hits.get(key, 0) for key in self.edge_items}
+        top = max(hits.values(), default=0)
+        for key, (line, _) in self.edge_items.items():
+            heat = hits[key] / top if top else 0.0
+            red = 160 + int(95 * heat)
+            other = int(160 * (1 - heat))
+            self.canvas.itemconfigure(line, fill=f"#{red:02x}{other:02x}{other:02x}", width=1 + 5 * heat)
 
     def simulate(self, cadena):
         if not self.dfa or not self.dfa.start:
             messagebox.showwarning("Error", "Debes marcar un estado inicial antes de simular.", parent=self)
             return
-        current = self.dfa.start
-        for symbol in cadena:
-            # Resaltar estado actual
-            x, y = self.state_positions[current]
-            r = 25
-            self.canvas.create_oval(x - r, y - r, x + r, y + r, outline="red", width=3)
-            self.update()
-            self.after(350)  # pausa para animación
-            current = self.dfa.transitions.get((current, symbol), None)
-            if not current:
-                break
-        if current and current in self.dfa.accept:
-            messagebox.showinfo("Resultado", f"La cadena '{cadena}' es aceptada ✅", parent=self)
+        self.stop_simulation()
+        if len(cadena) > SIM_JUMP_LENGTH:
+            # Sin animación: solo el estado final y el veredicto.
+            state, accepted = final_state(self.dfa, cadena)
+            trace = [state] if state is not None else []
         else:
-            messagebox.showinfo("Resultado", f"La cadena '{cadena}' es rechazada ❌", parent=self)
-        self.redraw()
+            trace, accepted = compute_trace(self.dfa, cadena)
+        self.player = TracePlayer(self, trace, accepted, self.show_simulation_state,
+                                  lambda ok: self.finish_simulation(cadena, ok),
+                                  delay=self.sim_speed.get())
+        if len(cadena) > SIM_JUMP_LENGTH:
+            self.player.jump_to_end()
+        else:
+            self.player.play()
+
+    def show_simulation_state(self, state: State):
+        # Un solo resaltado rojo: se reemplaza en cada paso.
+        self.canvas.delete("sim")
+        x, y = self.to_screen(*self.state_positions[state])
+        r = STATE_RADIUS * self.view_scale
+        self.canvas.create_oval(x - r, y - r, x + r, y + r, outline="red", width=3, tags=("sim",))
+
+    def finish_simulation(self, cadena, accepted):
+        shown = cadena if len(cadena) <= 40 else cadena[:40] + "…"
+        if accepted:
+            messagebox.showinfo("Resultado", f"La cadena '{shown}' es aceptada ✅", parent=self)
+        else:
+            messagebox.showinfo("Resultado", f"La cadena '{shown}' es rechazada ❌", parent=self)
+        self.canvas.delete("sim")
+
+    def stop_simulation(self):
+        if self.player is not None:
+            self.player.cancel()
+            self.player = None
+
+    def toggle_simulation(self):
+        if self.player is not None:
+            self.player.toggle()
+
+    def step_simulation(self):
+        if self.player is not None:
+            self.player.step()
+
+    def jump_simulation(self):
+        if self.player is not None:
+            self.player.jump_to_end()
+
+    def set_simulation_speed(self, value):
+        if self.player is not None:
+            self.player.set_delay(int(float(value)))
 
     def test_level(self):
         if not self.dfa.start:
             messagebox.showwarning("Error", "Debes marcar un estado inicial antes de probar el nivel.", parent=self)
             return
-
-        lvl = LEVELS[self.level_idx]
-        ok, msgs = lvl.validator(self.dfa)
+        self.start_validation(manual=True)
+
+    # ---------------- VALIDACIÓN EN SEGUNDO PLANO ----------------
+    def start_validation(self, manual=False):
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+            self._validate_job = None
+        self.validation_label.config(text=" Validando…")
+        self.validator.submit(LEVELS[self.level_idx], self.dfa,
+                              lambda ok, msgs: self.finish_validation(ok, msgs, manual),
+                              self.show_validation_progress)
+
+    def show_validation_progress(self, text):
+        self.validation_label.config(text=f" {text}")
+
+    def finish_validation(self, ok, msgs, manual):
+        self.validation_label.config(text=" ✅ Cumple el objetivo." if ok else " ❌ " + "\n".join(msgs[:2]))
+        if not manual:
+            return
         if ok:
             messagebox.showinfo("¡Correcto!", "Objetivo cumplido. Avanzas al siguiente nivel.", parent=self)
             self.level_idx = min(self.level_idx + 1, len(LEVELS) - 1)
             self.update_level_text()
+            self.validation_label.config(text="")
         else:
             messagebox.showwarning("Revisar", "\n".join(msgs), parent=self)
 
@@ -289,29 +631,72 @@ class App(tk.Tk):
             messagebox.showinfo("Tutorial", "¡Has completado el tutorial!", parent=self)
             self.is_tutorial = False
             self.update_tutorial_text()
+
+    def schedule_validation(self):
+        # Cada edición cancela la validación en curso y reinicia la espera.
+        self.cancel_validation()
+        self._validate_job = self.after(AUTO_VALIDATE_MS, self._auto_validate)
+
+    def cancel_validation(self):
+        self.validator.cancel()
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+            self._validate_job = None
+
+    def _auto_validate(self):
+        self._validate_job = None
+        if not self.dfa.start:
+            self.validation_label.config(text=" Marca un estado inicial para validar.")
+            return
+        self.start_validation()
+
     def get_state_at_position(self, x, y):
-        for st, (sx, sy) in self.state_positions.items():
-            if (x - sx)**2 + (y - sy)**2 <= 25**2:  # radio 25
-                return st
-        return None
+        # (x, y) en pantalla; el radio se mide en coordenadas del mundo.
+        return self.spatial.hit(*self.to_world(x, y), STATE_RADIUS)
     
     def start_drag(self, event):
         st = self.get_state_at_position(event.x, event.y)
         if st:
             self.dragging_state = st
             sx, sy = self.state_positions[st]
-            self.drag_offset_x = sx - event.x
-            self.drag_offset_y = sy - event.y
+            wx, wy = self.to_world(event.x, event.y)
+            self.drag_offset_x = sx - wx
+            self.drag_offset_y = sy - wy
+            self.drag_origin = (sx, sy)
+            self.drag_edges = list(self.incident_edges([st]))
+        else:
+            # Arrastrar sobre el fondo desplaza la vista.
+            self._pan = (event.x, event.y, self.view_x, self.view_y)
 
     def do_drag(self, event):
         if self.dragging_state:
-            new_x = event.x + self.drag_offset_x
-            new_y = event.y + self.drag_offset_y
+            wx, wy = self.to_world(event.x, event.y)
+            new_x = wx + self.drag_offset_x
+            new_y = wy + self.drag_offset_y
             self.state_positions[self.dragging_state] = (new_x, new_y)
-            self.redraw()
+            self.spatial.move(self.dragging_state, new_x, new_y)
+            # Varios eventos de movimiento se agrupan en una sola actualización.
+            if self._drag_job is None:
+                self._drag_job = self.after_idle(self._flush_drag, self.dragging_state)
+        elif self._pan is not None:
+            x0, y0, vx, vy = self._pan
+            self.view_x = vx - (event.x - x0) / self.view_scale
+            self.view_y = vy - (event.y - y0) / self.view_scale
+            self.schedule_view_redraw()
+
+    def _flush_drag(self, state):
+        self._drag_job = None
+        with instrument.timed("App.drag_frame", edges=len(self.drag_edges)):
+            self.move_state_items(state)
     
     def stop_drag(self, event):
+        st = self.dragging_state
+        if st and self.state_positions[st] != self.drag_origin:
+            # Todo el arrastre queda como una sola entrada del historial.
+            self.history.record([("move", st, self.state_positions[st])], [("move", st, self.drag_origin)])
+            self.index_edges(self.drag_edges)
         self.dragging_state = None
+        self._pan = None
     
     def delete_transition(self):
         if not self.dfa.states:
@@ -325,8 +710,8 @@ class App(tk.Tk):
         if not from_name or not to_name or not symbol:
             return
 
-        st_from = next((s for s in self.dfa.states if s.name == from_name), None)
-        st_to = next((s for s in self.dfa.states if s.name == to_name), None)
+        st_from = self.dfa.state_named(from_name)
+        st_to = self.dfa.state_named(to_name)
 
         if not st_from or not st_to:
             messagebox.showwarning("Error", "Estado no encontrado.", parent=self)
@@ -335,12 +720,85 @@ class App(tk.Tk):
         key = (st_from, symbol)
 
         if key in self.dfa.transitions and self.dfa.transitions[key] == st_to:
-            del self.dfa.transitions[key]
+            self.history.do([("edge", st_from, symbol, None)], [("edge", st_from, symbol, st_to)])
             messagebox.showinfo("Listo", "Transición eliminada.", parent=self)
             self.redraw()
         else:
             messagebox.showwarning("Error", "Esa transición no existe.", parent=self)
 
+    # ---------------- DESHACER / REHACER ----------------
+    def apply_edit(self, op):
+        kind = op[0]
+        touched = []
+        if kind in ("state", "move"):
+            touched = list(self.incident_edges([op[1]]))
+        apply_op(self.dfa, self.state_positions, self.spatial, op)
+        if kind == "edge":
+            touched = [(op[1], op[2])]
+        elif kind in ("state", "move"):
+            touched += self.incident_edges([op[1]])
+        self.index_edges(touched)
+        if kind != "move":
+            self.schedule_validation()
+
+    def undo(self, event=None):
+        if self.dfa is not None and not self.dragging_state:
+            self.stop_simulation()
+            if self.history.undo():
+                self.redraw()
+
+    def redo(self, event=None):
+        if self.dfa is not None and not self.dragging_state:
+            self.stop_simulation()
+            if self.history.redo():
+                self.redraw()
+
+    # ---------------- GUARDAR / ABRIR ----------------
+    def save_file(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, defaultextension=".json",
+            filetypes=[("Autómata JSON", "*.json"), ("Autómata binario", "*.afdb")])
+        if not path:
+            return
+        try:
+            if path.endswith(".afdb"):
+                storage.save_binary(path, self.dfa, self.state_positions)
+            else:
+                storage.save_json(path, self.dfa, self.state_positions)
+        except (OSError, RuntimeError) as e:
+            messagebox.showwarning("Error", f"No se pudo guardar: {e}", parent=self)
+
+    def load_file(self):
+        path = filedialog.askopenfilename(
+            parent=self, filetypes=[("Autómatas", "*.json *.afdb"), ("Todos", "*.*")])
+        if not path:
+            return
+        try:
+            if path.endswith(".afdb"):
+                compiled, coords = storage.load_binary(path)
+                dfa = compiled.to_dfa()
+                positions = storage.positions_by_state(compiled, coords) if coords is not None else {}
+            else:
+                dfa, positions = storage.load_json(path)
+        except (OSError, ValueError, KeyError) as e:
+            messagebox.showwarning("Error", f"No se pudo abrir: {e}", parent=self)
+            return
+        if not positions:
+            positions = layered_layout(dfa)
+        # Los estados sin posición se colocan en una rejilla.
+        for i, st in enumerate(sorted(dfa.states - positions.keys(), key=lambda s: s.name)):
+            positions[st] = (60 + (i % 10) * 80, 60 + (i // 10) * 80)
+        self.dfa = dfa
+        self.state_positions = positions
+        self.reindex()
+        self.history.clear()
+        self.schedule_validation()
+        names = {s.name for s in dfa.states}
+        self.state_counter = len(names)
+        while f"q{self.state_counter}" in names:
+            self.state_counter += 1
+        self.fit_view()
+
 def run_app():
     app = App()
     app.mainloop()
\ No newline at end of file
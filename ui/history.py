@@ -0,0 +1,103 @@
+# ui/history.py
+"""Historial de edición (deshacer/rehacer) con operaciones inversas.
+
+Cada entrada guarda solo las operaciones de la edición y sus inversas, nunca
+una copia del autómata: deshacer o rehacer cuesta lo mismo que la edición
+original, sin importar cuántos estados haya. Se conservan a lo sumo
+``limit`` entradas; al pasarse se descartan las más antiguas. Una edición
+sin operaciones no se registra (no vaciaría la pila de rehacer).
+
+Las operaciones son tuplas::
+
+    ("state", estado, (x, y))       crea el estado en esa posición
+    ("state", estado, None)         lo borra (con sus transiciones)
+    ("start", estado | None)
+    ("accept", estado, bool)
+    ("edge", origen, símbolo, destino | None)
+    ("move", estado, (x, y))
+"""
+from collections import deque
+from typing import Callable, Sequence, Tuple
+
+from automata.dfa import DFA
+
+Op = tuple
+
+def apply_op(dfa: DFA, positions: dict, spatial, op: Op) -> None:
+    kind = op[0]
+    if kind == "state":
+        _, state, pos = op
+        if pos is None:
+            dfa.remove_state(state)
+            positions.pop(state, None)
+            spatial.remove(state)
+        else:
+            dfa.add_state(state.name)
+            positions[state] = pos
+            spatial.insert(state, *pos)
+    elif kind == "start":
+        dfa.set_start(op[1])
+    elif kind == "accept":
+        dfa.set_accept(op[1], op[2])
+    elif kind == "edge":
+        _, frm, sym, to = op
+        if to is None:
+            if (frm, sym) in dfa.transitions:
+                dfa.remove_transition(frm, sym)
+        else:
+            dfa.set_transition(frm, sym, to)
+    elif kind == "move":
+        _, state, pos = op
+        positions[state] = pos
+        spatial.move(state, *pos)
+    else:
+        raise ValueError(f"Operación desconocida: {kind!r}")
+
+class History:
+    def __init__(self, apply: Callable[[Op], None], limit: int = 1000):
+        self.apply = apply
+        self.done: deque = deque(maxlen=limit)
+        self.undone = []
+
+    def do(self, forward: Sequence[Op], backward: Sequence[Op]) -> None:
+        """Aplica ``forward`` y la registra; ``backward`` la revierte."""
+        for op in forward:
+            self.apply(op)
+        self.record(forward, backward)
+
+    def record(self, forward: Sequence[Op], backward: Sequence[Op]) -> None:
+        # Para ediciones ya aplicadas (por ejemplo, al soltar un arrastre).
+        if not forward and not backward:
+            return
+        self.done.append((tuple(forward), tuple(backward)))
+        self.undone.clear()
+
+    def undo(self) -> bool:
+        if not self.done:
+            return False
+        entry: Tuple[tuple, tuple] = self.done.pop()
+        for op in entry[1]:
+            self.apply(op)
+        self.undone.append(entry)
+        return True
+
+    def redo(self) -> bool:
+        if not self.undone:
+            return False
+        entry = self.undone.pop()
+        for op in entry[0]:
+            self.apply(op)
+        self.done.append(entry)
+        return True
+
+    def clear(self) -> None:
+        self.done.clear()
+        self.undone.clear()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.done)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.undone)
@@ -0,0 +1,52 @@
+# ui/layout.py
+"""Acomodo automático de estados en capas a partir del inicial.
+
+Cada estado va a la columna de su distancia (BFS) desde ``dfa.start`` y,
+dentro de ella, en el orden en que lo descubre la búsqueda; como la BFS
+recorre los padres de arriba abajo, los hijos quedan cerca de sus padres y
+se cruzan pocas aristas. Los estados inalcanzables van en columnas al final.
+Las columnas con más de ``max_rows`` estados se parten en varias. Todo es
+O(|Q|·|Σ|), así que sirve para miles de estados.
+"""
+from collections import deque
+from typing import Dict, List, Tuple
+
+from automata.dfa import DFA, State
+
+def _layers(dfa: DFA) -> List[List[State]]:
+    symbols = sorted(dfa.alphabet)
+    transitions = dfa.transitions
+    layers = []
+    seen = set()
+    if dfa.start is not None:
+        seen.add(dfa.start)
+        frontier = deque([dfa.start])
+        while frontier:
+            layers.append(list(frontier))
+            nxt = deque()
+            for s in frontier:
+                for sym in symbols:
+                    to = transitions.get((s, sym))
+                    if to is not None and to not in seen:
+                        seen.add(to)
+                        nxt.append(to)
+            frontier = nxt
+    rest = sorted(dfa.states - seen, key=lambda s: s.name)
+    if rest:
+        layers.append(rest)
+    return layers
+
+def layered_layout(dfa: DFA, dx: float = 140, dy: float = 90, origin: Tuple[float, float] = (80, 80),
+                   max_rows: int = 40) -> Dict[State, Tuple[float, float]]:
+    columns = []
+    for layer in _layers(dfa):
+        columns.extend(layer[i:i + max_rows] for i in range(0, len(layer), max_rows))
+    height = max((len(col) for col in columns), default=0)
+    x0, y0 = origin
+    positions = {}
+    for c, col in enumerate(columns):
+        # Columnas centradas respecto de la más alta.
+        top = y0 + (height - len(col)) * dy / 2
+        for r, s in enumerate(col):
+            positions[s] = (x0 + c * dx, top + r * dy)
+    return positions
@@ -0,0 +1,114 @@
+# ui/simulation.py
+"""Simulación paso a paso de una cadena sin bloquear el bucle de Tk.
+
+La traza completa se calcula antes de empezar y luego se reproduce con
+callbacks programados mediante ``after``, de modo que la ventana sigue
+respondiendo y la animación puede pausarse, avanzar paso a paso, cambiar de
+velocidad o cancelarse.
+"""
+from typing import Callable, List, Optional, Tuple
+
+from automata import instrument
+from automata.dfa import DFA, State
+
+def compute_trace(dfa: DFA, cadena: str) -> Tuple[List[State], bool]:
+    """Estados visitados (desde el inicial) y si la cadena es aceptada.
+
+    Si falta una transición la traza se corta en el último estado alcanzado
+    y la cadena se rechaza.
+    """
+    transitions = dfa.transitions
+    current = dfa.start
+    trace = [current]
+    for symbol in cadena:
+        current = transitions.get((current, symbol))
+        if current is None:
+            break
+        trace.append(current)
+    if instrument.ENABLED:
+        instrument.transition_hits.update(zip(trace[:-1], cadena))
+    return trace, current is not None and current in dfa.accept
+
+def final_state(dfa: DFA, cadena: str) -> Tuple[Optional[State], bool]:
+    # Para entradas largas: solo el estado final, con la tabla compilada.
+    compiled = dfa.compile()
+    state_id = compiled.run_state(cadena)
+    return compiled.state_of(state_id), bool(compiled.accepting[state_id])
+
+class TracePlayer:
+    def __init__(self, widget, trace: List[State], accepted: bool,
+                 on_step: Callable[[State], None], on_finish: Callable[[bool], None],
+                 delay: int = 350):
+        self.widget = widget
+        self.trace = trace
+        self.accepted = accepted
+        self.on_step = on_step
+        self.on_finish = on_finish
+        self.delay = delay
+        self.index = 0
+        self.paused = True
+        self.done = False
+        self._job = None
+
+    def _cancel_job(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _schedule(self):
+        self._cancel_job()
+        if not self.paused and not self.done:
+            self._job = self.widget.after(self.delay, self._tick)
+
+    def _tick(self):
+        self._job = None
+        self._advance()
+        self._schedule()
+
+    def _advance(self):
+        if self.done:
+            return
+        if self.index < len(self.trace):
+            self.on_step(self.trace[self.index])
+            self.index += 1
+        else:
+            self.done = True
+            self.on_finish(self.accepted)
+
+    def play(self):
+        self.paused = False
+        if self.index == 0:
+            self._advance()
+        self._schedule()
+
+    def pause(self):
+        self.paused = True
+        self._cancel_job()
+
+    def toggle(self):
+        if self.paused:
+            self.play()
+        else:
+            self.pause()
+
+    def step(self):
+        self.pause()
+        self._advance()
+
+    def set_delay(self, delay: int):
+        self.delay = int(delay)
+        self._schedule()
+
+    def jump_to_end(self):
+        """Salta al resultado: muestra solo el último estado."""
+        self.pause()
+        if self.done:
+            return
+        if self.trace and self.index < len(self.trace):
+            self.index = len(self.trace) - 1
+            self._advance()
+        self._advance()
+
+    def cancel(self):
+        self._cancel_job()
+        self.done = True
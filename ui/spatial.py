@@ -0,0 +1,207 @@
+# ui/spatial.py
+"""Índice espacial de rejilla uniforme para los centros de los estados.
+
+No depende de Tkinter: guarda claves arbitrarias (normalmente ``State``) y
+sus coordenadas, repartidas en celdas cuadradas de lado ``cell``. Las
+consultas solo miran las celdas que pueden contener resultados, así que su
+costo no crece con el número total de estados.
+"""
+import math
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+class SpatialGrid:
+    def __init__(self, cell: float = 64):
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self.positions: Dict[Hashable, Tuple[float, float]] = {}
+
+    def _cell_of(self, x, y):
+        return int(math.floor(x / self.cell)), int(math.floor(y / self.cell))
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def clear(self):
+        self.cells.clear()
+        self.positions.clear()
+
+    def insert(self, key, x, y):
+        if key in self.positions:
+            self.remove(key)
+        self.positions[key] = (x, y)
+        self.cells.setdefault(self._cell_of(x, y), set()).add(key)
+
+    def remove(self, key):
+        x, y = self.positions.pop(key)
+        c = self._cell_of(x, y)
+        bucket = self.cells[c]
+        bucket.discard(key)
+        if not bucket:
+            del self.cells[c]
+
+    def move(self, key, x, y):
+        old = self.positions.get(key)
+        if old is not None and self._cell_of(*old) == self._cell_of(x, y):
+            self.positions[key] = (x, y)
+        else:
+            self.insert(key, x, y)
+
+    def rebuild(self, positions):
+        self.clear()
+        for key, (x, y) in positions.items():
+            self.insert(key, x, y)
+
+    def in_rect(self, x1, y1, x2, y2) -> List[Hashable]:
+        """Claves cuyo centro cae dentro del rectángulo (bordes incluidos)."""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        cx1, cy1 = self._cell_of(x1, y1)
+        cx2, cy2 = self._cell_of(x2, y2)
+        found = []
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self.cells):
+            # Rectángulo enorme: es más barato recorrer las celdas ocupadas.
+            candidates = (k for bucket in self.cells.values() for k in bucket)
+        else:
+            candidates = (k for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1)
+                          for k in self.cells.get((cx, cy), ()))
+        for key in candidates:
+            x, y = self.positions[key]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                found.append(key)
+        return found
+
+    def nearest(self, x, y, max_dist: Optional[float] = None):
+        """Clave más cercana a (x, y), o ``None`` si no hay ninguna a ``max_dist``."""
+        if not self.positions:
+            return None
+        limit = math.inf if max_dist is None else max_dist
+        cx, cy = self._cell_of(x, y)
+        best, best_d2 = None, limit * limit
+        ring = 0
+        # Anillos de celdas alrededor del punto hasta que ninguno pueda mejorar.
+        while (ring - 1) * self.cell <= min(math.sqrt(best_d2), limit):
+            if ring > 0 and (2 * ring + 1) ** 2 > 4 * len(self.cells):
+                return self._nearest_scan(x, y, best_d2)
+            for key in self._ring(cx, cy, ring):
+                px, py = self.positions[key]
+                d2 = (px - x) ** 2 + (py - y) ** 2
+                if d2 <= best_d2:
+                    best, best_d2 = key, d2
+            ring += 1
+        return best
+
+    def _nearest_scan(self, x, y, best_d2):
+        best = None
+        for key, (px, py) in self.positions.items():
+            d2 = (px - x) ** 2 + (py - y) ** 2
+            if d2 <= best_d2:
+                best, best_d2 = key, d2
+        return best
+
+    def _ring(self, cx, cy, ring):
+        cells = self.cells
+        if ring == 0:
+            yield from cells.get((cx, cy), ())
+            return
+        for dx in range(-ring, ring + 1):
+            yield from cells.get((cx + dx, cy - ring), ())
+            yield from cells.get((cx + dx, cy + ring), ())
+        for dy in range(-ring + 1, ring):
+            yield from cells.get((cx - ring, cy + dy), ())
+            yield from cells.get((cx + ring, cy + dy), ())
+
+    def hit(self, x, y, radius: float):
+        """Estado cuyo círculo de radio ``radius`` contiene el punto."""
+        return self.nearest(x, y, radius)
+
+def segment_in_rect(x1, y1, x2, y2, rx1, ry1, rx2, ry2) -> bool:
+    """Si el segmento toca el rectángulo (recorte de Liang–Barsky)."""
+    t0, t1 = 0.0, 1.0
+    dx, dy = x2 - x1, y2 - y1
+    for p, q in ((-dx, x1 - rx1), (dx, rx2 - x1), (-dy, y1 - ry1), (dy, ry2 - y1)):
+        if p == 0:
+            if q < 0:
+                return False
+        elif p < 0:
+            t0 = max(t0, q / p)
+        else:
+            t1 = min(t1, q / p)
+    return t0 <= t1
+
+class SegmentGrid:
+    """Rejilla de segmentos (aristas): cada uno se anota en las celdas que cruza.
+
+    Sirve para encontrar aristas que atraviesan la vista aunque sus dos
+    extremos queden fuera. Una arista larga ocupa ~longitud/``cell`` celdas.
+    """
+
+    def __init__(self, cell: float = 256):
+        self.cell = cell
+        self.cells: Dict[Tuple[int, int], Set[Hashable]] = {}
+        self.segments: Dict[Hashable, List[Tuple[int, int]]] = {}
+
+    def __len__(self):
+        return len(self.segments)
+
+    def clear(self):
+        self.cells.clear()
+        self.segments.clear()
+
+    def _cells_on(self, x1, y1, x2, y2) -> List[Tuple[int, int]]:
+        # Recorrido de celdas de Amanatides–Woo, de la celda de (x1, y1) a la de (x2, y2).
+        c = self.cell
+        cx, cy = int(math.floor(x1 / c)), int(math.floor(y1 / c))
+        ex, ey = int(math.floor(x2 / c)), int(math.floor(y2 / c))
+        dx, dy = x2 - x1, y2 - y1
+        step_x = 1 if ex > cx else -1
+        step_y = 1 if ey > cy else -1
+        t_x = ((cx + (step_x > 0)) * c - x1) / dx if dx else math.inf
+        t_y = ((cy + (step_y > 0)) * c - y1) / dy if dy else math.inf
+        dt_x = c / abs(dx) if dx else math.inf
+        dt_y = c / abs(dy) if dy else math.inf
+        cells = [(cx, cy)]
+        while (cx, cy) != (ex, ey):
+            if cy == ey or (cx != ex and t_x < t_y):
+                cx += step_x
+                t_x += dt_x
+            else:
+                cy += step_y
+                t_y += dt_y
+            cells.append((cx, cy))
+        return cells
+
+    def insert(self, key, x1, y1, x2, y2):
+        if key in self.segments:
+            self.remove(key)
+        cells = self._cells_on(x1, y1, x2, y2)
+        self.segments[key] = cells
+        for c in cells:
+            self.cells.setdefault(c, set()).add(key)
+
+    def remove(self, key):
+        for c in self.segments.pop(key, ()):
+            bucket = self.cells[c]
+            bucket.discard(key)
+            if not bucket:
+                del self.cells[c]
+
+    def in_rect(self, x1, y1, x2, y2) -> Set[Hashable]:
+        """Segmentos que pasan por alguna celda que toca el rectángulo (candidatos)."""
+        x1, x2 = min(x1, x2), max(x1, x2)
+        y1, y2 = min(y1, y2), max(y1, y2)
+        c = self.cell
+        cx1, cy1 = int(math.floor(x1 / c)), int(math.floor(y1 / c))
+        cx2, cy2 = int(math.floor(x2 / c)), int(math.floor(y2 / c))
+        found = set()
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self.cells):
+            for (cx, cy), bucket in self.cells.items():
+                if cx1 <= cx <= cx2 and cy1 <= cy <= cy2:
+                    found |= bucket
+        else:
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    found |= self.cells.get((cx, cy), set())
+        return found
@@ -0,0 +1,101 @@
+# ui/validation.py
+"""Validación de niveles en segundo plano sin bloquear el bucle de Tk.
+
+Las validaciones corren en un solo hilo de trabajo sobre una copia del AFD
+(los ``State`` son inmutables, así que basta con copiar los contenedores).
+El hilo nunca toca widgets: publica el avance en una cola que la interfaz
+revisa con ``after``. Enviar una validación nueva o llamar a ``cancel``
+invalida la anterior; el hilo la abandona en la siguiente etapa y cualquier
+resultado atrasado se descarta. Las etapas largas (minimización, autómata
+producto, conteos) consultan la cancelación cada pocos miles de pasos y se
+interrumpen con ``Cancelled``.
+"""
+import queue
+import threading
+from typing import Callable, Optional
+
+from automata.dfa import DFA, Cancelled
+
+def snapshot(dfa: DFA) -> DFA:
+    return DFA(alphabet=set(dfa.alphabet), states=set(dfa.states), start=dfa.start,
+               accept=set(dfa.accept), transitions=dict(dfa.transitions))
+
+class ValidationWorker:
+    def __init__(self, widget, poll_ms: int = 50):
+        self.widget = widget
+        self.poll_ms = poll_ms
+        self.jobs: queue.Queue = queue.Queue()
+        self.events: queue.Queue = queue.Queue()
+        self.generation = 0
+        self._callbacks = None
+        self._thread: Optional[threading.Thread] = None
+        self._poll_job = None
+
+    @property
+    def busy(self) -> bool:
+        return self._callbacks is not None
+
+    def submit(self, level, dfa: DFA, on_done: Callable[[bool, list], None],
+               on_progress: Optional[Callable[[str], None]] = None) -> None:
+        """Valida ``dfa`` contra ``level``; ``on_done(ok, msgs)`` corre en el hilo de Tk."""
+        self.cancel()
+        self._callbacks = (on_progress, on_done)
+        self.jobs.put((self.generation, level, snapshot(dfa)))
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._work, name="validacion", daemon=True)
+            self._thread.start()
+        self._poll_job = self.widget.after(self.poll_ms, self._poll)
+
+    def cancel(self) -> None:
+        self.generation += 1
+        self._callbacks = None
+        if self._poll_job is not None:
+            self.widget.after_cancel(self._poll_job)
+            self._poll_job = None
+
+    # ---------------- HILO DE TRABAJO ----------------
+    def _work(self):
+        while True:
+            gen, level, dfa = self.jobs.get()
+            try:
+                self._validate(gen, level, dfa)
+            except Cancelled:
+                pass
+            except Exception as e:  # el error se muestra como resultado, no tumba el hilo
+                self.events.put((gen, "done", False, [f"Error al validar: {e}"]))
+
+    def _validate(self, gen, level, dfa):
+        def cancel():
+            return gen != self.generation
+        stages = (("Compilando el autómata…", dfa.compile),
+                  ("Minimizando…", lambda: dfa.canonical_hash(cancel)))
+        for text, stage in stages:
+            if gen != self.generation:
+                return
+            self.events.put((gen, "progress", text))
+            stage()
+        if gen != self.generation:
+            return
+        self.events.put((gen, "progress", "Comparando con la referencia…"))
+        ok, msgs = level.validate(dfa, cancel)
+        self.events.put((gen, "done", ok, msgs))
+
+    # ---------------- HILO DE TK ----------------
+    def _poll(self):
+        self._poll_job = None
+        while self._callbacks is not None:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] != self.generation:
+                continue
+            on_progress, on_done = self._callbacks
+            if event[1] == "progress":
+                if on_progress is not None:
+                    on_progress(event[2])
+            else:
+                self._callbacks = None
+                on_done(event[2], event[3])
+        if self._callbacks is not None:
+            self._poll_job = self.widget.after(self.poll_ms, self._poll)